@@ -1,5 +1,7 @@
 """JWT validation using shared secret from Better Auth."""
 
+import hashlib
+import time
 from dataclasses import dataclass
 
 import jwt
@@ -10,8 +12,14 @@ from ..config import settings
 
 security = HTTPBearer()
 
+# Verified tokens keyed by SHA-256 digest of the raw token, so repeat
+# requests with the same token skip signature verification.
+_CACHE_MAXSIZE = 10_000
+_CACHE_TTL = 30  # seconds
+_CACHE_EXP_MARGIN = 5  # stop serving a cached result this long before exp
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class CurrentUser:
     """Authenticated user from JWT."""
 
@@ -19,6 +27,9 @@ class CurrentUser:
     email: str
 
 
+_token_cache: dict[bytes, tuple[float, dict, CurrentUser]] = {}
+
+
 def decode_jwt(token: str) -> dict:
     """
     Decode and validate JWT using shared secret (HS256).
@@ -26,6 +37,30 @@ def decode_jwt(token: str) -> dict:
     Raises:
         HTTPException(401): If token is invalid
     """
+    return _authenticate(token)[0]
+
+
+def _authenticate(token: str) -> tuple[dict, CurrentUser]:
+    """
+    Verify a token and build its CurrentUser.
+
+    Successful results are cached for up to 30 seconds (never past the
+    token's own expiry), so repeat requests reuse both the payload and the
+    CurrentUser instance. Failures are not cached.
+
+    Raises:
+        HTTPException(401): If token is invalid
+    """
+    key = hashlib.sha256(token.encode()).digest()
+    now = time.time()
+
+    cached = _token_cache.get(key)
+    if cached is not None:
+        expires_at, payload, user = cached
+        if now < expires_at:
+            return payload, user
+        _token_cache.pop(key, None)
+
     try:
         payload = jwt.decode(
             token,
@@ -33,12 +68,33 @@ def decode_jwt(token: str) -> dict:
             algorithms=["HS256"],
             options={"verify_aud": False, "verify_iss": False},
         )
-        return payload
-
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
-    except jwt.InvalidTokenError as e:
-        raise HTTPException(status_code=401, detail=f"Invalid authentication token: {e}")
+    except jwt.InvalidTokenError:
+        # Fixed detail: don't echo PyJWT's reason back to the client
+        raise HTTPException(status_code=401, detail="Invalid authentication token")
+
+    user = CurrentUser(
+        id=payload["sub"],
+        email=payload.get("email", ""),
+    )
+    _cache_result(key, payload, user, now)
+    return payload, user
+
+
+def _cache_result(key: bytes, payload: dict, user: CurrentUser, now: float) -> None:
+    """Store a verified result, clamping its lifetime to the token's exp."""
+    ttl = _CACHE_TTL
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        ttl = min(ttl, exp - now - _CACHE_EXP_MARGIN)
+    if ttl <= 0:
+        return
+
+    if len(_token_cache) >= _CACHE_MAXSIZE:
+        # Evict the oldest entry (dicts preserve insertion order)
+        _token_cache.pop(next(iter(_token_cache)))
+    _token_cache[key] = (now + ttl, payload, user)
 
 
 async def get_current_user(
@@ -52,10 +108,4 @@ async def get_current_user(
         async def list_tasks(user: CurrentUser = Depends(get_current_user)):
             ...
     """
-    token = credentials.credentials
-    payload = decode_jwt(token)
-
-    return CurrentUser(
-        id=payload["sub"],
-        email=payload.get("email", ""),
-    )
+    return _authenticate(credentials.credentials)[1]
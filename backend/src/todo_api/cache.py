@@ -0,0 +1,85 @@
+"""Redis response cache for task list queries.
+
+Caching is enabled by setting REDIS_URL. Cached pages are keyed by user,
+a per-user version number and a hash of the query string; every task write
+bumps the user's version, so stale pages are never read again and simply
+expire.
+"""
+
+import hashlib
+from typing import Any, Optional
+
+from .config import settings
+
+CACHE_ENABLED = bool(settings.REDIS_URL)
+
+# Seconds a cached task list page stays valid
+LIST_TTL = 30
+
+_redis: Optional[Any] = None  # redis.asyncio.Redis once init_cache() has run
+
+
+async def init_cache() -> None:
+    """Connect the shared Redis client. Called on application startup."""
+    global _redis
+    if not CACHE_ENABLED or _redis is not None:
+        return
+    # Imported here so the app runs without redis installed when caching is off
+    from redis.asyncio import Redis
+
+    _redis = Redis.from_url(settings.REDIS_URL)
+
+
+async def close_cache() -> None:
+    """Close the shared Redis client. Called on application shutdown."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+def _version_key(user_id: str) -> str:
+    return f"tasks:ver:{user_id}"
+
+
+async def get_task_list(user_id: str, query: str) -> tuple[Optional[str], Optional[bytes]]:
+    """Look up a cached task list page.
+
+    Args:
+        user_id: Owner of the tasks
+        query: The request's raw query string
+
+    Returns:
+        (key, body): key to store a freshly built page under (None when
+        caching is unavailable) and the cached JSON body, if any
+    """
+    if _redis is None:
+        return None, None
+    try:
+        version = await _redis.get(_version_key(user_id)) or b"0"
+        digest = hashlib.sha256(query.encode()).hexdigest()
+        key = f"tasks:{user_id}:{version.decode()}:{digest}"
+        return key, await _redis.get(key)
+    except Exception:
+        # A cache outage must never fail the request; fall back to the DB
+        return None, None
+
+
+async def set_task_list(key: str, body: bytes) -> None:
+    """Store a task list page under a key from get_task_list()."""
+    if _redis is None:
+        return
+    try:
+        await _redis.set(key, body, ex=LIST_TTL)
+    except Exception:
+        pass  # Best effort, like event publishing
+
+
+async def invalidate_tasks(user_id: str) -> None:
+    """Retire every cached task list page for a user after a write."""
+    if _redis is None:
+        return
+    try:
+        await _redis.incr(_version_key(user_id))
+    except Exception:
+        pass  # Unbumped versions still expire after LIST_TTL
@@ -6,15 +6,22 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
 
-    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
 
     DATABASE_URL: str
+    DB_POOL: bool = True  # set False for serverless deployments (NullPool)
     BETTER_AUTH_SECRET: str
     BETTER_AUTH_URL: str = "http://localhost:3000"
     CORS_ORIGINS: str = "*"
     OPENAI_API_KEY: str = ""
     KAFKA_BOOTSTRAP_SERVERS: str = "localhost:9092"
     EVENTS_ENABLED: bool = False
+    REDIS_URL: str = ""  # e.g. redis://localhost:6379/0; empty disables caching
 
 
 settings = Settings()
+
+# Derived values, computed once at import
+ALLOWED_ORIGINS: tuple[str, ...] = tuple(
+    o.strip() for o in settings.CORS_ORIGINS.split(",") if o.strip()
+)
@@ -1,23 +1,84 @@
 """Database configuration and session management."""
 
-from sqlalchemy.pool import NullPool
+import orjson
+from sqlalchemy import text
+from sqlalchemy.pool import NullPool, QueuePool
 from sqlmodel import Session, SQLModel, create_engine
 
 from .config import settings
 
+if settings.DB_POOL:
+    # Keep warm connections so each Session skips the connect/auth handshake
+    _pool_options = {
+        "poolclass": QueuePool,
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
+else:
+    _pool_options = {"poolclass": NullPool}
+
 engine = create_engine(
     settings.DATABASE_URL,
-    poolclass=NullPool,
     echo=False,
+    # Room for the many filter/sort combinations of the list queries
+    query_cache_size=1200,
+    # JSON/JSONB columns are encoded and decoded with orjson
+    json_serializer=lambda value: orjson.dumps(value).decode(),
+    json_deserializer=orjson.loads,
+    **_pool_options,
 )
 
 
+# Columns created as json before they became jsonb; create_all never alters them
+_JSONB_COLUMNS = (("tasks", "tags"), ("messages", "tool_calls"))
+
+
 def create_db_and_tables():
-    """Create all SQLModel tables."""
+    """Create all SQLModel tables, plus any indexes missing from existing tables."""
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
     SQLModel.metadata.create_all(engine)
 
+    if engine.dialect.name == "postgresql":
+        _upgrade_json_columns()
+
+    # create_all skips tables that already exist, including their new indexes
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+
+def _upgrade_json_columns():
+    """Convert legacy json columns to jsonb so GIN indexes and ?| filters work."""
+    with engine.begin() as conn:
+        for table, column in _JSONB_COLUMNS:
+            data_type = conn.execute(
+                text(
+                    "SELECT data_type FROM information_schema.columns"
+                    " WHERE table_schema = current_schema()"
+                    " AND table_name = :table AND column_name = :column"
+                ),
+                {"table": table, "column": column},
+            ).scalar()
+            if data_type == "json":
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {table} ALTER COLUMN {column}"
+                        f" TYPE jsonb USING {column}::jsonb"
+                    )
+                )
+
 
 def get_session():
-    """FastAPI dependency for database sessions."""
-    with Session(engine) as session:
+    """FastAPI dependency for database sessions.
+
+    Objects stay loaded after commit: every column value is set in Python,
+    so there is nothing to re-read and routes can return them without a
+    refresh SELECT.
+    """
+    with Session(engine, expire_on_commit=False) as session:
         yield session
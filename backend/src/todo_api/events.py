@@ -1,11 +1,17 @@
 """Event publishing for Dapr/Kafka integration - Phase V."""
 
+import asyncio
+import logging
 import os
+from contextlib import suppress
 from datetime import datetime, timezone
 from typing import Literal, Optional
 from uuid import UUID, uuid4
 
 import httpx
+import orjson
+
+from .config import settings
 
 # Dapr sidecar configuration
 DAPR_HTTP_PORT = int(os.getenv("DAPR_HTTP_PORT", 3500))
@@ -13,37 +19,148 @@ DAPR_URL = f"http://localhost:{DAPR_HTTP_PORT}"
 PUBSUB_NAME = "kafka-pubsub"
 
 # Feature flag to enable/disable events
-EVENTS_ENABLED = os.getenv("EVENTS_ENABLED", "false").lower() == "true"
+EVENTS_ENABLED = settings.EVENTS_ENABLED
 
+# Background publishing: request handlers enqueue, a worker task drains
+QUEUE_MAXSIZE = 10_000
+BATCH_SIZE = 64
+SHUTDOWN_FLUSH_TIMEOUT = 5.0  # seconds
+
+# Shared client so every publish reuses pooled keep-alive connections
+_client: Optional[httpx.AsyncClient] = None
+_queue: Optional[asyncio.Queue[tuple[str, dict]]] = None
+_worker: Optional[asyncio.Task] = None
+
+# Events dropped because the queue was full or not running
+dropped_events = 0
+
+logger = logging.getLogger(__name__)
 
-async def publish_event(topic: str, event: dict) -> bool:
-    """Publish an event to a Kafka topic via Dapr.
+
+def _ensure_client() -> httpx.AsyncClient:
+    """Return the shared Dapr client, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=DAPR_URL,
+            timeout=5.0,
+            limits=httpx.Limits(max_keepalive_connections=32),
+        )
+    return _client
+
+
+async def init_events() -> None:
+    """Create the shared Dapr HTTP client and start the publish worker.
+
+    Called on application startup.
+    """
+    global _queue, _worker
+    if not EVENTS_ENABLED:
+        return
+    _ensure_client()
+    if _worker is None:
+        _queue = asyncio.Queue(maxsize=QUEUE_MAXSIZE)
+        _worker = asyncio.create_task(_publish_worker())
+
+
+async def close_events() -> None:
+    """Flush queued events, stop the worker and close the HTTP client.
+
+    Called on application shutdown.
+    """
+    global _client, _queue, _worker
+    if _worker is not None:
+        try:
+            await asyncio.wait_for(_queue.join(), timeout=SHUTDOWN_FLUSH_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+        _worker.cancel()
+        # Let an in-flight publish unwind before the client is closed under it
+        with suppress(asyncio.CancelledError):
+            await _worker
+        _worker = None
+        _queue = None
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def enqueue_event(topic: str, event: dict) -> bool:
+    """Queue an event for background publishing without blocking.
 
     Args:
         topic: The topic name (e.g., "task-events")
         event: The event payload
 
     Returns:
-        True if published successfully, False otherwise
+        True if queued (or events are disabled), False if the event was dropped
     """
+    global dropped_events
     if not EVENTS_ENABLED:
         return True  # Skip if events disabled
 
+    if _queue is None:
+        dropped_events += 1
+        return False
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{DAPR_URL}/v1.0/publish/{PUBSUB_NAME}/{topic}",
-                json=event,
-                headers={"Content-Type": "application/json"},
-                timeout=5.0,
+        _queue.put_nowait((topic, event))
+    except asyncio.QueueFull:
+        dropped_events += 1
+        return False
+    return True
+
+
+async def _publish_worker() -> None:
+    """Drain the event queue, publishing up to BATCH_SIZE events concurrently."""
+    while True:
+        batch = [await _queue.get()]
+        while len(batch) < BATCH_SIZE and not _queue.empty():
+            batch.append(_queue.get_nowait())
+
+        try:
+            results = await asyncio.gather(
+                *(publish_event(topic, event) for topic, event in batch),
+                return_exceptions=True,
             )
-            return response.status_code in (200, 204)
+            # One bad event (e.g. a payload orjson cannot serialize) must not
+            # kill the worker and leave the queue to fill up
+            for (topic, _), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    logger.error("Failed to publish event to %s", topic, exc_info=result)
+        finally:
+            for _ in batch:
+                _queue.task_done()
+
+
+async def publish_event(topic: str, event: dict) -> bool:
+    """Publish an event to a Kafka topic via Dapr, awaiting the sidecar.
+
+    Request handlers should use enqueue_event() instead. Outside the
+    application lifespan the shared client is created on first use.
+
+    Args:
+        topic: The topic name (e.g., "task-events")
+        event: The event payload (UUID and datetime values are serialized by orjson)
+
+    Returns:
+        True if published successfully, False otherwise
+    """
+    if not EVENTS_ENABLED:
+        return True  # Skip if events disabled
+
+    try:
+        response = await _ensure_client().post(
+            f"/v1.0/publish/{PUBSUB_NAME}/{topic}",
+            content=orjson.dumps(event),
+            headers={"Content-Type": "application/json"},
+        )
+        return response.status_code in (200, 204)
     except httpx.RequestError:
         # Log error but don't fail the request
         return False
 
 
-async def publish_task_event(
+def publish_task_event(
     event_type: Literal["created", "updated", "completed", "deleted"],
     user_id: str,
     task_id: UUID,
@@ -60,23 +177,23 @@ async def publish_task_event(
         source: Source of the event ("api" or "chat")
 
     Returns:
-        True if published successfully
+        True if queued for publishing
     """
     event = {
-        "event_id": str(uuid4()),
+        "event_id": uuid4(),
         "event_type": event_type,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": datetime.now(timezone.utc),
         "user_id": user_id,
-        "task_id": str(task_id),
+        "task_id": task_id,
         "task_data": task_data or {},
         "metadata": {
             "source": source,
         },
     }
-    return await publish_event("task-events", event)
+    return enqueue_event("task-events", event)
 
 
-async def publish_reminder_event(
+def publish_reminder_event(
     task_id: UUID,
     user_id: str,
     title: str,
@@ -95,22 +212,22 @@ async def publish_reminder_event(
         reminder_type: Type of reminder
 
     Returns:
-        True if published successfully
+        True if queued for publishing
     """
     event = {
-        "event_id": str(uuid4()),
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "task_id": str(task_id),
+        "event_id": uuid4(),
+        "timestamp": datetime.now(timezone.utc),
+        "task_id": task_id,
         "user_id": user_id,
         "title": title,
-        "due_at": due_at.isoformat(),
-        "remind_at": remind_at.isoformat(),
+        "due_at": due_at,
+        "remind_at": remind_at,
         "reminder_type": reminder_type,
     }
-    return await publish_event("reminders", event)
+    return enqueue_event("reminders", event)
 
 
-async def publish_task_update(
+def publish_task_update(
     update_type: Literal["created", "updated", "deleted"],
     user_id: str,
     task: dict,
@@ -123,16 +240,16 @@ async def publish_task_update(
         task: Task data for the UI
 
     Returns:
-        True if published successfully
+        True if queued for publishing
     """
     event = {
-        "event_id": str(uuid4()),
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "event_id": uuid4(),
+        "timestamp": datetime.now(timezone.utc),
         "user_id": user_id,
         "update_type": update_type,
         "task": task,
     }
-    return await publish_event("task-updates", event)
+    return enqueue_event("task-updates", event)
 
 
 # Dapr subscription endpoint for programmatic subscriptions
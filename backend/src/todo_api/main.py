@@ -5,9 +5,12 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
-from .config import settings
+from .cache import close_cache, init_cache
+from .config import ALLOWED_ORIGINS, settings
 from .database import create_db_and_tables
+from .events import close_events, init_events
 from .routers import chat, tasks
 
 # Export OPENAI_API_KEY so the OpenAI Agents SDK can find it
@@ -17,9 +20,13 @@ if settings.OPENAI_API_KEY and not os.getenv("OPENAI_API_KEY"):
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Application lifespan - create tables on startup."""
+    """Application lifespan - create tables, event and cache clients on startup."""
     create_db_and_tables()
+    await init_events()
+    await init_cache()
     yield
+    await close_cache()
+    await close_events()
 
 
 app = FastAPI(
@@ -27,14 +34,20 @@ app = FastAPI(
     description="Phase II Todo API with FastAPI and SQLModel",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# A bare "*" without credentials lets Starlette answer with a literal
+# wildcard instead of matching each request's origin.
+cors_allow_all = ALLOWED_ORIGINS == ("*",)
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS.split(","),
-    allow_credentials=True,
+    allow_origins=list(ALLOWED_ORIGINS),
+    allow_credentials=not cors_allow_all,
     allow_methods=["GET", "POST", "PATCH", "DELETE"],
-    allow_headers=["Authorization", "Content-Type"],
+    allow_headers=["Authorization", "Content-Type", "If-None-Match"],
+    expose_headers=["ETag"],
 )
 
 app.include_router(tasks.router)
@@ -1,13 +1,61 @@
 """MCP task tools for the AI agent - Phase V with advanced features."""
 
-from datetime import datetime, timedelta, timezone
-from typing import Optional
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Callable, Optional
 from uuid import UUID
 
-from sqlmodel import Session, func, or_, select
+from sqlalchemy import cast, delete, insert, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Session, func, select
 
 from ..database import engine
 from ..models import Task
+from ..queries import (
+    PRIORITY_ORDER,
+    TITLE_ORDER,
+    calculate_next_due_date,
+    tags_match_any,
+)
+
+VALID_PRIORITIES = frozenset(("high", "medium", "low"))
+VALID_RECURRING = frozenset(("daily", "weekly", "monthly"))
+
+# Reminders fire this long before a task's due date
+_REMINDER_OFFSET = timedelta(hours=1)
+
+
+@lru_cache(maxsize=1024)
+def _parse_iso(value: str) -> datetime:
+    """Parse an ISO 8601 datetime (accepts a trailing "Z"); raises ValueError."""
+    return datetime.fromisoformat(value)
+
+
+def _tags_jsonb():
+    """Task.tags as a non-null JSONB array, for in-database tag edits."""
+    return func.coalesce(cast(Task.tags, JSONB), func.jsonb_build_array())
+
+
+def _rewrite_tags(
+    session: Session, task_uuid: UUID, user_id: str, edit: Callable[[list[str]], list[str]]
+) -> Optional[tuple[str, list[str]]]:
+    """Read-modify-write tag edit for dialects without JSONB operators (SQLite in tests).
+
+    Returns:
+        (title, tags) after the edit, or None if the user has no such task
+    """
+    task = session.exec(
+        select(Task).where(Task.id == task_uuid, Task.user_id == user_id)
+    ).first()
+    if task is None:
+        return None
+    title, current = task.title, list(task.tags or [])
+    tags = edit(current)
+    if tags != current:
+        task.tags = tags
+        session.add(task)
+        session.commit()
+    return title, tags
 
 
 def add_task(
@@ -33,23 +81,23 @@ def add_task(
     Returns:
         dict with task_id, status, and title
     """
-    with Session(engine) as session:
+    with Session(engine, expire_on_commit=False) as session:
         # Parse due_date if provided
         parsed_due_date = None
         reminder_at = None
         if due_date:
             try:
-                parsed_due_date = datetime.fromisoformat(due_date.replace("Z", "+00:00"))
-                reminder_at = parsed_due_date - timedelta(hours=1)
+                parsed_due_date = _parse_iso(due_date)
+                reminder_at = parsed_due_date - _REMINDER_OFFSET
             except ValueError:
                 return {"error": f"Invalid due_date format: {due_date}. Use ISO format."}
 
         # Validate priority
-        if priority not in ["high", "medium", "low"]:
+        if priority not in VALID_PRIORITIES:
             priority = "medium"
 
         # Validate recurring
-        if recurring and recurring not in ["daily", "weekly", "monthly"]:
+        if recurring and recurring not in VALID_RECURRING:
             recurring = None
 
         task = Task(
@@ -64,7 +112,6 @@ def add_task(
         )
         session.add(task)
         session.commit()
-        session.refresh(task)
 
         result = {
             "task_id": str(task.id),
@@ -105,60 +152,66 @@ def list_tasks(
     Returns:
         list of task dictionaries
     """
-    with Session(engine) as session:
-        statement = select(Task).where(Task.user_id == user_id)
+    # Collect filters in a fixed order so equivalent calls share one
+    # compiled-statement cache entry; values are always bound parameters.
+    conditions = [Task.user_id == user_id]
 
-        # Status filter
-        if status == "pending":
-            statement = statement.where(Task.completed == False)  # noqa: E712
-        elif status == "completed":
-            statement = statement.where(Task.completed == True)  # noqa: E712
+    # Status filter
+    if status == "pending":
+        conditions.append(Task.completed == False)  # noqa: E712
+    elif status == "completed":
+        conditions.append(Task.completed == True)  # noqa: E712
 
-        # Priority filter
-        if priority and priority in ["high", "medium", "low"]:
-            statement = statement.where(Task.priority == priority)
+    # Priority filter
+    if priority and priority in VALID_PRIORITIES:
+        conditions.append(Task.priority == priority)
 
-        # Tags filter
-        if tags:
-            tag_conditions = [Task.tags.contains([tag]) for tag in tags]
-            statement = statement.where(or_(*tag_conditions))
+    # Tags filter
+    if tags:
+        conditions.append(tags_match_any(tags, engine.dialect.name))
 
-        # Search
-        if search:
-            search_term = f"%{search.lower()}%"
-            statement = statement.where(func.lower(Task.title).like(search_term))
+    # Search
+    if search:
+        conditions.append(Task.title.ilike(f"%{search}%"))
+
+    with Session(engine) as session:
+        # Project only the returned columns; rows skip ORM object hydration
+        statement = select(
+            Task.id,
+            Task.title,
+            Task.completed,
+            Task.description,
+            Task.priority,
+            Task.tags,
+            Task.due_date,
+            Task.recurring,
+        ).where(*conditions)
 
         # Sorting
         if sort_by == "due_date":
             statement = statement.order_by(Task.due_date.asc().nullslast())
         elif sort_by == "priority":
-            priority_order = func.case(
-                (Task.priority == "high", 1),
-                (Task.priority == "medium", 2),
-                (Task.priority == "low", 3),
-                else_=4,
-            )
-            statement = statement.order_by(priority_order.asc())
+            statement = statement.order_by(PRIORITY_ORDER.asc())
         elif sort_by == "title":
-            statement = statement.order_by(func.lower(Task.title).asc())
+            statement = statement.order_by(TITLE_ORDER.asc())
         else:
             statement = statement.order_by(Task.created_at.desc())
 
         statement = statement.limit(limit)
-        tasks = session.exec(statement).all()
+        rows = session.exec(statement).all()
 
         return [
             {
-                "id": str(t.id),
-                "title": t.title,
-                "completed": t.completed,
-                "description": t.description,
-                "priority": t.priority,
-                "tags": t.tags or [],
-                "due_date": t.due_date.isoformat() if t.due_date else None,
-                "recurring": t.recurring,
+                "id": str(r.id),
+                "title": r.title,
+                "completed": r.completed,
+                "description": r.description,
+                "priority": r.priority,
+                "tags": r.tags or [],
+                "due_date": r.due_date.isoformat() if r.due_date else None,
+                "recurring": r.recurring,
             }
-            for t in tasks
+            for r in rows
         ]
 
 
@@ -193,36 +246,37 @@ def complete_task(user_id: str, task_id: str) -> dict:
         if not task:
             return {"error": "Task not found"}
 
-        task.completed = True
-        task.updated_at = datetime.now(timezone.utc)
+        session.exec(
+            update(Task)
+            .where(Task.id == task.id)
+            .values(completed=True)
+        )
 
         result = {"task_id": str(task.id), "status": "completed", "title": task.title}
 
-        # Handle recurring task
+        # Handle recurring task: spawn the next occurrence in the same transaction
         if task.recurring and task.due_date:
             next_due_date = calculate_next_due_date(task.due_date, task.recurring)
-            next_task = Task(
-                user_id=user_id,
-                title=task.title,
-                description=task.description,
-                priority=task.priority,
-                tags=task.tags,
-                due_date=next_due_date,
-                reminder_at=next_due_date - timedelta(hours=1),
-                recurring=task.recurring,
-                recurring_parent_id=task.id,
-            )
-            session.add(next_task)
-            session.add(task)
-            session.commit()
-            session.refresh(next_task)
-            result["next_task_id"] = str(next_task.id)
+            next_task_id = session.exec(
+                insert(Task)
+                .values(
+                    user_id=user_id,
+                    title=task.title,
+                    description=task.description,
+                    priority=task.priority,
+                    tags=task.tags,
+                    due_date=next_due_date,
+                    reminder_at=next_due_date - _REMINDER_OFFSET,
+                    recurring=task.recurring,
+                    recurring_parent_id=task.id,
+                )
+                .returning(Task.id)
+            ).scalar_one()
+            result["next_task_id"] = str(next_task_id)
             result["next_due_date"] = next_due_date.isoformat()
             result["message"] = f"Task completed. Next occurrence created for {next_due_date.strftime('%Y-%m-%d')}"
-        else:
-            session.add(task)
-            session.commit()
 
+        session.commit()
         return result
 
 
@@ -237,14 +291,13 @@ def delete_task(user_id: str, task_id: str) -> dict:
         dict with deletion status
     """
     with Session(engine) as session:
-        statement = select(Task).where(
-            Task.id == UUID(task_id), Task.user_id == user_id
-        )
-        task = session.exec(statement).first()
-        if not task:
+        title = session.exec(
+            delete(Task)
+            .where(Task.id == UUID(task_id), Task.user_id == user_id)
+            .returning(Task.title)
+        ).scalar_one_or_none()
+        if title is None:
             return {"error": "Task not found"}
-        title = task.title
-        session.delete(task)
         session.commit()
         return {"task_id": task_id, "status": "deleted", "title": title}
 
@@ -274,7 +327,7 @@ def update_task(
     Returns:
         dict with update status
     """
-    with Session(engine) as session:
+    with Session(engine, expire_on_commit=False) as session:
         statement = select(Task).where(
             Task.id == UUID(task_id), Task.user_id == user_id
         )
@@ -286,26 +339,24 @@ def update_task(
             task.title = title
         if description is not None:
             task.description = description
-        if priority is not None and priority in ["high", "medium", "low"]:
+        if priority is not None and priority in VALID_PRIORITIES:
             task.priority = priority
         if tags is not None:
             task.tags = tags
         if due_date is not None:
             try:
-                task.due_date = datetime.fromisoformat(due_date.replace("Z", "+00:00"))
-                task.reminder_at = task.due_date - timedelta(hours=1)
+                task.due_date = _parse_iso(due_date)
+                task.reminder_at = task.due_date - _REMINDER_OFFSET
             except ValueError:
                 return {"error": f"Invalid due_date format: {due_date}"}
         if recurring is not None:
-            if recurring in ["daily", "weekly", "monthly", ""]:
+            if recurring == "" or recurring in VALID_RECURRING:
                 task.recurring = recurring if recurring else None
             else:
                 return {"error": f"Invalid recurring pattern: {recurring}"}
 
-        task.updated_at = datetime.now(timezone.utc)
         session.add(task)
         session.commit()
-        session.refresh(task)
 
         return {
             "task_id": str(task.id),
@@ -328,27 +379,25 @@ def set_priority(user_id: str, task_id: str, priority: str) -> dict:
     Returns:
         dict with update status
     """
-    if priority not in ["high", "medium", "low"]:
+    if priority not in VALID_PRIORITIES:
         return {"error": f"Invalid priority: {priority}. Must be high, medium, or low."}
 
     with Session(engine) as session:
-        statement = select(Task).where(
-            Task.id == UUID(task_id), Task.user_id == user_id
-        )
-        task = session.exec(statement).first()
-        if not task:
+        row = session.exec(
+            update(Task)
+            .where(Task.id == UUID(task_id), Task.user_id == user_id)
+            .values(priority=priority)
+            .returning(Task.id, Task.title)
+        ).first()
+        if row is None:
             return {"error": "Task not found"}
-
-        task.priority = priority
-        task.updated_at = datetime.now(timezone.utc)
-        session.add(task)
         session.commit()
 
         return {
-            "task_id": str(task.id),
+            "task_id": str(row.id),
             "status": "updated",
-            "title": task.title,
-            "priority": task.priority,
+            "title": row.title,
+            "priority": priority,
         }
 
 
@@ -363,27 +412,42 @@ def add_tag(user_id: str, task_id: str, tag: str) -> dict:
     Returns:
         dict with update status and current tags
     """
+    task_uuid = UUID(task_id)
     with Session(engine) as session:
-        statement = select(Task).where(
-            Task.id == UUID(task_id), Task.user_id == user_id
-        )
-        task = session.exec(statement).first()
-        if not task:
-            return {"error": "Task not found"}
-
-        current_tags = list(task.tags) if task.tags else []
-        if tag not in current_tags:
-            current_tags.append(tag)
-            task.tags = current_tags
-            task.updated_at = datetime.now(timezone.utc)
-            session.add(task)
+        if engine.dialect.name == "postgresql":
+            tags = _tags_jsonb()
+            # Append in a single statement; no row means missing task or tag already present
+            row = session.exec(
+                update(Task)
+                .where(Task.id == task_uuid, Task.user_id == user_id, ~tags.contains([tag]))
+                .values(tags=cast(tags.op("||")(func.jsonb_build_array(tag)), Task.tags.type))
+                .returning(Task.title, Task.tags)
+                .execution_options(synchronize_session=False)
+            ).first()
             session.commit()
+        else:
+            row = _rewrite_tags(
+                session,
+                task_uuid,
+                user_id,
+                lambda current: current if tag in current else [*current, tag],
+            )
+
+        if row is None:
+            row = session.exec(
+                select(Task.title, Task.tags).where(
+                    Task.id == task_uuid, Task.user_id == user_id
+                )
+            ).first()
+            if row is None:
+                return {"error": "Task not found"}
 
+        title, current_tags = row
         return {
-            "task_id": str(task.id),
+            "task_id": str(task_uuid),
             "status": "updated",
-            "title": task.title,
-            "tags": current_tags,
+            "title": title,
+            "tags": current_tags or [],
         }
 
 
@@ -398,27 +462,39 @@ def remove_tag(user_id: str, task_id: str, tag: str) -> dict:
     Returns:
         dict with update status and current tags
     """
+    task_uuid = UUID(task_id)
     with Session(engine) as session:
-        statement = select(Task).where(
-            Task.id == UUID(task_id), Task.user_id == user_id
-        )
-        task = session.exec(statement).first()
-        if not task:
-            return {"error": "Task not found"}
-
-        current_tags = list(task.tags) if task.tags else []
-        if tag in current_tags:
-            current_tags.remove(tag)
-            task.tags = current_tags
-            task.updated_at = datetime.now(timezone.utc)
-            session.add(task)
+        if engine.dialect.name == "postgresql":
+            tags = _tags_jsonb()
+            # Remove in a single statement; no row means missing task or tag not present
+            row = session.exec(
+                update(Task)
+                .where(Task.id == task_uuid, Task.user_id == user_id, tags.contains([tag]))
+                .values(tags=cast(tags.op("-")(tag), Task.tags.type))
+                .returning(Task.title, Task.tags)
+                .execution_options(synchronize_session=False)
+            ).first()
             session.commit()
+        else:
+            row = _rewrite_tags(
+                session, task_uuid, user_id, lambda current: [t for t in current if t != tag]
+            )
+
+        if row is None:
+            row = session.exec(
+                select(Task.title, Task.tags).where(
+                    Task.id == task_uuid, Task.user_id == user_id
+                )
+            ).first()
+            if row is None:
+                return {"error": "Task not found"}
 
+        title, current_tags = row
         return {
-            "task_id": str(task.id),
+            "task_id": str(task_uuid),
             "status": "updated",
-            "title": task.title,
-            "tags": current_tags,
+            "title": title,
+            "tags": current_tags or [],
         }
 
 
@@ -434,30 +510,28 @@ def set_due_date(user_id: str, task_id: str, due_date: str) -> dict:
         dict with update status
     """
     try:
-        parsed_date = datetime.fromisoformat(due_date.replace("Z", "+00:00"))
+        parsed_date = _parse_iso(due_date)
     except ValueError:
         return {"error": f"Invalid due_date format: {due_date}. Use ISO format."}
 
+    reminder_at = parsed_date - _REMINDER_OFFSET
     with Session(engine) as session:
-        statement = select(Task).where(
-            Task.id == UUID(task_id), Task.user_id == user_id
-        )
-        task = session.exec(statement).first()
-        if not task:
+        row = session.exec(
+            update(Task)
+            .where(Task.id == UUID(task_id), Task.user_id == user_id)
+            .values(due_date=parsed_date, reminder_at=reminder_at)
+            .returning(Task.id, Task.title)
+        ).first()
+        if row is None:
             return {"error": "Task not found"}
-
-        task.due_date = parsed_date
-        task.reminder_at = parsed_date - timedelta(hours=1)
-        task.updated_at = datetime.now(timezone.utc)
-        session.add(task)
         session.commit()
 
         return {
-            "task_id": str(task.id),
+            "task_id": str(row.id),
             "status": "updated",
-            "title": task.title,
-            "due_date": task.due_date.isoformat(),
-            "reminder_at": task.reminder_at.isoformat(),
+            "title": row.title,
+            "due_date": parsed_date.isoformat(),
+            "reminder_at": reminder_at.isoformat(),
         }
 
 
@@ -484,7 +558,7 @@ def create_recurring_task(
     Returns:
         dict with task creation status
     """
-    if pattern not in ["daily", "weekly", "monthly"]:
+    if pattern not in VALID_RECURRING:
         return {"error": f"Invalid pattern: {pattern}. Must be daily, weekly, or monthly."}
 
     return add_task(
@@ -496,14 +570,3 @@ def create_recurring_task(
         due_date=due_date,
         recurring=pattern,
     )
-
-
-def calculate_next_due_date(current_due: datetime, pattern: str) -> datetime:
-    """Calculate the next due date based on recurring pattern."""
-    if pattern == "daily":
-        return current_due + timedelta(days=1)
-    elif pattern == "weekly":
-        return current_due + timedelta(weeks=1)
-    elif pattern == "monthly":
-        return current_due + timedelta(days=30)
-    return current_due
@@ -2,14 +2,26 @@
 
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Literal, Optional
+from typing import Optional
 from uuid import UUID, uuid4
 
-from pydantic import field_validator
-from sqlalchemy import Column
+from pydantic import ConfigDict
 from sqlalchemy import JSON as SA_JSON
+from sqlalchemy import Column, Index, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import Field, SQLModel
 
+# Binary JSONB on PostgreSQL, plain JSON elsewhere (e.g. SQLite in tests)
+_JSONB_OR_JSON = SA_JSON().with_variant(JSONB(), "postgresql")
+
+# Rows written outside the ORM (COPY, raw SQL) still get a creation time
+_SERVER_NOW = {"server_default": func.now()}
+
+
+def _utcnow() -> datetime:
+    """Current UTC time, the ORM-side default for creation timestamps."""
+    return datetime.now(timezone.utc)
+
 
 # --- Phase V: Enums ---
 
@@ -44,16 +56,41 @@ class Task(TaskBase, table=True):
     """Task database model."""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Serves list queries filtered by status and ordered by creation time;
+        # its (user_id, completed) prefix also serves the pending/completed counts
+        Index("ix_tasks_user_completed_created", "user_id", "completed", "created_at"),
+        # Default unfiltered listing and its (created_at, id) keyset cursor
+        Index("ix_tasks_user_created", "user_id", "created_at", "id"),
+        # Priority filter and due-date sort
+        Index("ix_tasks_user_priority", "user_id", "priority"),
+        Index("ix_tasks_user_due", "user_id", "due_date"),
+        # Trigram index so ILIKE '%term%' title search avoids a sequential scan
+        Index(
+            "ix_tasks_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Any-of tag filtering (tags ?| array[...])
+        Index("ix_tasks_tags_gin", "tags", postgresql_using="gin").ddl_if(
+            dialect="postgresql"
+        ),
+    )
+    # Fetch the server-side updated_at with RETURNING on flush instead of
+    # expiring it and reloading on next access
+    __mapper_args__ = {"eager_defaults": True}
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     user_id: str = Field(index=True, nullable=False)
     completed: bool = Field(default=False)
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: Optional[datetime] = Field(default=None)
+    created_at: datetime = Field(default_factory=_utcnow, sa_column_kwargs=_SERVER_NOW)
+    # Stamped by the database on every UPDATE, ORM flush or bulk statement alike
+    updated_at: Optional[datetime] = Field(default=None, sa_column_kwargs={"onupdate": func.now()})
 
     # Phase V: Advanced features
     priority: str = Field(default="medium", max_length=10)
-    tags: list[str] = Field(default=[], sa_column=Column(SA_JSON))
+    tags: list[str] = Field(default=[], sa_column=Column(_JSONB_OR_JSON))
     due_date: Optional[datetime] = Field(default=None)
     reminder_at: Optional[datetime] = Field(default=None)
     recurring: Optional[str] = Field(default=None, max_length=20)
@@ -63,90 +100,29 @@ class Task(TaskBase, table=True):
 class TaskCreate(TaskBase):
     """Schema for creating a task."""
 
+    # Strip and enum checks run inside pydantic-core, not per-field callbacks
+    model_config = ConfigDict(str_strip_whitespace=True, use_enum_values=True)
+
     # Phase V fields
-    priority: str = Field(default="medium")
+    priority: Priority = Priority.MEDIUM
     tags: list[str] = Field(default=[])
     due_date: Optional[datetime] = None
-    recurring: Optional[str] = None
-
-    @field_validator("title")
-    @classmethod
-    def validate_title(cls, v: str) -> str:
-        v = v.strip()
-        if not v:
-            raise ValueError("Title cannot be empty")
-        if len(v) > 200:
-            raise ValueError("Title must be 200 characters or less")
-        return v
-
-    @field_validator("description")
-    @classmethod
-    def validate_description(cls, v: str) -> str:
-        v = v.strip()
-        if len(v) > 1000:
-            raise ValueError("Description must be 1000 characters or less")
-        return v
-
-    @field_validator("priority")
-    @classmethod
-    def validate_priority(cls, v: str) -> str:
-        if v not in ["high", "medium", "low"]:
-            raise ValueError("Priority must be high, medium, or low")
-        return v
-
-    @field_validator("recurring")
-    @classmethod
-    def validate_recurring(cls, v: Optional[str]) -> Optional[str]:
-        if v is not None and v not in ["daily", "weekly", "monthly"]:
-            raise ValueError("Recurring must be daily, weekly, or monthly")
-        return v
+    recurring: Optional[RecurringPattern] = None
 
 
 class TaskUpdate(SQLModel):
     """Schema for updating a task (all fields optional)."""
 
+    model_config = ConfigDict(str_strip_whitespace=True, use_enum_values=True)
+
     title: Optional[str] = Field(default=None, min_length=1, max_length=200)
     description: Optional[str] = Field(default=None, max_length=1000)
     completed: Optional[bool] = None
     # Phase V fields
-    priority: Optional[str] = None
+    priority: Optional[Priority] = None
     tags: Optional[list[str]] = None
     due_date: Optional[datetime] = None
-    recurring: Optional[str] = None
-
-    @field_validator("title")
-    @classmethod
-    def validate_title(cls, v: Optional[str]) -> Optional[str]:
-        if v is not None:
-            v = v.strip()
-            if not v:
-                raise ValueError("Title cannot be empty")
-            if len(v) > 200:
-                raise ValueError("Title must be 200 characters or less")
-        return v
-
-    @field_validator("description")
-    @classmethod
-    def validate_description(cls, v: Optional[str]) -> Optional[str]:
-        if v is not None:
-            v = v.strip()
-            if len(v) > 1000:
-                raise ValueError("Description must be 1000 characters or less")
-        return v
-
-    @field_validator("priority")
-    @classmethod
-    def validate_priority(cls, v: Optional[str]) -> Optional[str]:
-        if v is not None and v not in ["high", "medium", "low"]:
-            raise ValueError("Priority must be high, medium, or low")
-        return v
-
-    @field_validator("recurring")
-    @classmethod
-    def validate_recurring(cls, v: Optional[str]) -> Optional[str]:
-        if v is not None and v not in ["daily", "weekly", "monthly"]:
-            raise ValueError("Recurring must be daily, weekly, or monthly")
-        return v
+    recurring: Optional[RecurringPattern] = None
 
 
 class TaskRead(TaskBase):
@@ -157,10 +133,10 @@ class TaskRead(TaskBase):
     created_at: datetime
     updated_at: Optional[datetime]
     # Phase V fields
-    priority: str
+    priority: Priority
     tags: list[str]
     due_date: Optional[datetime]
-    recurring: Optional[str]
+    recurring: Optional[RecurringPattern]
     recurring_parent_id: Optional[UUID]
 
 
@@ -171,6 +147,7 @@ class TaskListResponse(SQLModel):
     total: int
     pending_count: int = 0
     completed_count: int = 0
+    next_cursor: Optional[str] = None  # set for full pages in creation-time order
 
 
 # --- Phase III: Conversation & Message Models ---
@@ -184,22 +161,41 @@ class Conversation(SQLModel, table=True):
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     user_id: str = Field(index=True, nullable=False)
     title: str = Field(default="", max_length=200)
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: datetime = Field(default_factory=_utcnow, sa_column_kwargs=_SERVER_NOW)
     updated_at: Optional[datetime] = Field(default=None)
 
 
+# Last activity: updated_at, or created_at for conversations never replied to.
+# The conversation list sorts and pages on (CONVERSATION_ACTIVITY, id).
+CONVERSATION_ACTIVITY = func.coalesce(Conversation.updated_at, Conversation.created_at)
+
+# Serves the per-user list ordered by most recent activity and its keyset cursor.
+# PostgreSQL only: SQLite does not reflect expression indexes, so the
+# checkfirst pass in create_db_and_tables would try to build it twice.
+Index(
+    "ix_conversations_user_activity",
+    Conversation.user_id,
+    CONVERSATION_ACTIVITY,
+    Conversation.id,
+).ddl_if(dialect="postgresql")
+
+
 class Message(SQLModel, table=True):
     """Message database model."""
 
     __tablename__ = "messages"
+    __table_args__ = (
+        # Serves conversation history read in chronological order
+        Index("ix_messages_conversation_created", "conversation_id", "created_at"),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     conversation_id: UUID = Field(foreign_key="conversations.id", index=True)
     user_id: str = Field(nullable=False)
     role: str = Field(max_length=20)  # "user" or "assistant"
     content: str = Field(nullable=False)
-    tool_calls: Optional[dict] = Field(default=None, sa_type=SA_JSON)
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    tool_calls: Optional[list[dict]] = Field(default=None, sa_type=_JSONB_OR_JSON)
+    created_at: datetime = Field(default_factory=_utcnow, sa_column_kwargs=_SERVER_NOW)
 
 
 # --- Phase III: Chat Schemas ---
@@ -233,7 +229,8 @@ class ConversationListResponse(SQLModel):
     """Response schema for conversation list."""
 
     conversations: list[ConversationRead]
-    total: int
+    total: Optional[int] = None  # only computed when include_total=true
+    next_cursor: Optional[str] = None
 
 
 class MessageRead(SQLModel):
@@ -242,7 +239,7 @@ class MessageRead(SQLModel):
     id: UUID
     role: str
     content: str
-    tool_calls: Optional[dict] = None
+    tool_calls: Optional[list[dict]] = None
     created_at: datetime
 
 
@@ -266,5 +263,7 @@ class AuditLog(SQLModel, table=True):
     user_id: str = Field(index=True)
     task_id: Optional[UUID] = Field(default=None)
     task_data: Optional[dict] = Field(default=None, sa_column=Column(SA_JSON))
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), index=True)
+    timestamp: datetime = Field(
+        default_factory=_utcnow, index=True, sa_column_kwargs=_SERVER_NOW
+    )
     source: Optional[str] = Field(default=None, max_length=100)  # api, chat, recurring-service
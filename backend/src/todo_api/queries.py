@@ -0,0 +1,54 @@
+"""Task query expressions and recurrence rules shared by the REST routes and agent tools."""
+
+import calendar
+from datetime import datetime, timedelta
+
+from sqlalchemy import Text, case, cast, exists
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlmodel import func
+
+from .models import Task
+
+# Fixed-length recurrence steps; "monthly" is calendar-based (see _add_month)
+_RECURRING_DELTA = {
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+}
+_NO_DELTA = timedelta(0)
+
+# Sort keys built once at import
+# Priority ordering: high > medium > low
+PRIORITY_ORDER = case(
+    (Task.priority == "high", 1),
+    (Task.priority == "medium", 2),
+    (Task.priority == "low", 3),
+    else_=4,
+)
+# Case-insensitive title ordering
+TITLE_ORDER = func.lower(Task.title)
+
+
+def tags_match_any(tags: list[str], dialect: str):
+    """Filter condition: the task has at least one of tags.
+
+    On PostgreSQL this is the JSONB ?| operator, served by the tags GIN
+    index; elsewhere (SQLite in tests) it scans the array with json_each.
+    """
+    if dialect == "postgresql":
+        return Task.tags.op("?|")(cast(tags, ARRAY(Text)))
+    tag = func.json_each(Task.tags).table_valued("value")
+    return exists().where(tag.c.value.in_(tags))
+
+
+def calculate_next_due_date(current_due: datetime, pattern: str) -> datetime:
+    """Calculate the next due date based on recurring pattern."""
+    if pattern == "monthly":
+        return _add_month(current_due)
+    return current_due + _RECURRING_DELTA.get(pattern, _NO_DELTA)
+
+
+def _add_month(dt: datetime) -> datetime:
+    """Return the same day next month, clamped to that month's last day."""
+    year, month = (dt.year + 1, 1) if dt.month == 12 else (dt.year, dt.month + 1)
+    day = min(dt.day, calendar.monthrange(year, month)[1])
+    return dt.replace(year=year, month=month, day=day)
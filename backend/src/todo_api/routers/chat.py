@@ -1,29 +1,42 @@
 """Chat and conversation routes - Phase V with advanced features."""
 
-import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Optional
+from functools import lru_cache, wraps
+from typing import Any, Callable, Optional
 from uuid import UUID
 
-from agents import Agent, Runner, RunContextWrapper, function_tool
-from fastapi import APIRouter, Depends, HTTPException
+import orjson
+from agents import Agent, FunctionTool, Runner, RunContextWrapper, function_tool
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import exists, tuple_
 from sqlmodel import Session, func, select
 
 from ..auth.jwt import CurrentUser, get_current_user
+from ..cache import invalidate_tasks
 from ..config import settings
-from ..database import get_session
+from ..database import engine, get_session
+from ..mcp import tools as mcp_tools
 from ..models import (
+    CONVERSATION_ACTIVITY,
     ChatRequest,
     ChatResponse,
     Conversation,
     ConversationListResponse,
+    ConversationRead,
     Message,
     MessageListResponse,
+    MessageRead,
 )
 
 router = APIRouter(prefix="/api/v1", tags=["chat"])
 
+# Number of prior messages sent to the agent as context on each turn
+HISTORY_LIMIT = 20
+
 
 # --- Context for tools ---
 
@@ -38,7 +51,20 @@ class ChatContext:
 # --- Agent tools ---
 
 
-@function_tool
+def _agent_tool(fn: Callable[..., Any]) -> FunctionTool:
+    """Register fn as an agent tool whose result is returned as JSON.
+
+    The tool schema is still built from fn's own signature and docstring.
+    """
+
+    @wraps(fn)
+    def wrapper(ctx: RunContextWrapper[ChatContext], *args: Any, **kwargs: Any) -> str:
+        return orjson.dumps(fn(ctx, *args, **kwargs)).decode()
+
+    return function_tool(wrapper)
+
+
+@_agent_tool
 def add_task(
     ctx: RunContextWrapper[ChatContext],
     title: str,
@@ -47,7 +73,7 @@ def add_task(
     tags: Optional[list[str]] = None,
     due_date: Optional[str] = None,
     recurring: Optional[str] = None,
-) -> str:
+) -> dict:
     """Create a new task with optional priority, tags, due date, and recurring pattern.
 
     Args:
@@ -58,9 +84,7 @@ def add_task(
         due_date: ISO format datetime string like "2024-01-20T18:00:00Z" (optional)
         recurring: Recurring pattern - "daily", "weekly", or "monthly" (optional)
     """
-    from ..mcp.tools import add_task as _add_task
-
-    result = _add_task(
+    return mcp_tools.add_task(
         ctx.context.user_id,
         title,
         description,
@@ -69,10 +93,9 @@ def add_task(
         due_date,
         recurring,
     )
-    return json.dumps(result)
 
 
-@function_tool
+@_agent_tool
 def list_tasks(
     ctx: RunContextWrapper[ChatContext],
     status: str = "all",
@@ -80,7 +103,7 @@ def list_tasks(
     tags: Optional[list[str]] = None,
     search: Optional[str] = None,
     sort_by: Optional[str] = None,
-) -> str:
+) -> list[dict]:
     """View tasks with optional filters, search, and sorting.
 
     Args:
@@ -90,9 +113,7 @@ def list_tasks(
         search: Search keyword in title
         sort_by: Sort by: "due_date", "priority", "title", or "created_at"
     """
-    from ..mcp.tools import list_tasks as _list_tasks
-
-    result = _list_tasks(
+    return mcp_tools.list_tasks(
         ctx.context.user_id,
         status,
         priority,
@@ -100,49 +121,39 @@ def list_tasks(
         search,
         sort_by,
     )
-    return json.dumps(result)
 
 
-@function_tool
-def search_tasks(ctx: RunContextWrapper[ChatContext], query: str) -> str:
+@_agent_tool
+def search_tasks(ctx: RunContextWrapper[ChatContext], query: str) -> list[dict]:
     """Search tasks by keyword in title.
 
     Args:
         query: Search keyword
     """
-    from ..mcp.tools import search_tasks as _search_tasks
+    return mcp_tools.search_tasks(ctx.context.user_id, query)
 
-    result = _search_tasks(ctx.context.user_id, query)
-    return json.dumps(result)
 
-
-@function_tool
-def complete_task(ctx: RunContextWrapper[ChatContext], task_id: str) -> str:
+@_agent_tool
+def complete_task(ctx: RunContextWrapper[ChatContext], task_id: str) -> dict:
     """Mark a task as done. For recurring tasks, creates the next occurrence.
 
     Args:
         task_id: UUID of the task to complete
     """
-    from ..mcp.tools import complete_task as _complete_task
-
-    result = _complete_task(ctx.context.user_id, task_id)
-    return json.dumps(result)
+    return mcp_tools.complete_task(ctx.context.user_id, task_id)
 
 
-@function_tool
-def delete_task(ctx: RunContextWrapper[ChatContext], task_id: str) -> str:
+@_agent_tool
+def delete_task(ctx: RunContextWrapper[ChatContext], task_id: str) -> dict:
     """Remove a task from the list.
 
     Args:
         task_id: UUID of the task to delete
     """
-    from ..mcp.tools import delete_task as _delete_task
+    return mcp_tools.delete_task(ctx.context.user_id, task_id)
 
-    result = _delete_task(ctx.context.user_id, task_id)
-    return json.dumps(result)
 
-
-@function_tool
+@_agent_tool
 def update_task(
     ctx: RunContextWrapper[ChatContext],
     task_id: str,
@@ -152,7 +163,7 @@ def update_task(
     tags: Optional[list[str]] = None,
     due_date: Optional[str] = None,
     recurring: Optional[str] = None,
-) -> str:
+) -> dict:
     """Update a task's properties.
 
     Args:
@@ -164,9 +175,7 @@ def update_task(
         due_date: New due date in ISO format
         recurring: New recurring pattern - "daily", "weekly", "monthly", or "" to clear
     """
-    from ..mcp.tools import update_task as _update_task
-
-    result = _update_task(
+    return mcp_tools.update_task(
         ctx.context.user_id,
         task_id,
         title=title if title else None,
@@ -176,82 +185,69 @@ def update_task(
         due_date=due_date,
         recurring=recurring,
     )
-    return json.dumps(result)
 
 
-@function_tool
+@_agent_tool
 def set_priority(
     ctx: RunContextWrapper[ChatContext],
     task_id: str,
     priority: str,
-) -> str:
+) -> dict:
     """Set task priority.
 
     Args:
         task_id: UUID of the task
         priority: Priority level - "high", "medium", or "low"
     """
-    from ..mcp.tools import set_priority as _set_priority
-
-    result = _set_priority(ctx.context.user_id, task_id, priority)
-    return json.dumps(result)
+    return mcp_tools.set_priority(ctx.context.user_id, task_id, priority)
 
 
-@function_tool
+@_agent_tool
 def add_tag(
     ctx: RunContextWrapper[ChatContext],
     task_id: str,
     tag: str,
-) -> str:
+) -> dict:
     """Add a tag to a task.
 
     Args:
         task_id: UUID of the task
         tag: Tag to add
     """
-    from ..mcp.tools import add_tag as _add_tag
+    return mcp_tools.add_tag(ctx.context.user_id, task_id, tag)
 
-    result = _add_tag(ctx.context.user_id, task_id, tag)
-    return json.dumps(result)
 
-
-@function_tool
+@_agent_tool
 def remove_tag(
     ctx: RunContextWrapper[ChatContext],
     task_id: str,
     tag: str,
-) -> str:
+) -> dict:
     """Remove a tag from a task.
 
     Args:
         task_id: UUID of the task
         tag: Tag to remove
     """
-    from ..mcp.tools import remove_tag as _remove_tag
-
-    result = _remove_tag(ctx.context.user_id, task_id, tag)
-    return json.dumps(result)
+    return mcp_tools.remove_tag(ctx.context.user_id, task_id, tag)
 
 
-@function_tool
+@_agent_tool
 def set_due_date(
     ctx: RunContextWrapper[ChatContext],
     task_id: str,
     due_date: str,
-) -> str:
+) -> dict:
     """Set or update task due date.
 
     Args:
         task_id: UUID of the task
         due_date: Due date in ISO format (e.g., "2024-01-20T18:00:00Z")
     """
-    from ..mcp.tools import set_due_date as _set_due_date
+    return mcp_tools.set_due_date(ctx.context.user_id, task_id, due_date)
 
-    result = _set_due_date(ctx.context.user_id, task_id, due_date)
-    return json.dumps(result)
 
-
-@function_tool
+@_agent_tool
 def create_recurring_task(
     ctx: RunContextWrapper[ChatContext],
     title: str,
@@ -260,7 +256,7 @@ def create_recurring_task(
     description: str = "",
     priority: str = "medium",
     tags: Optional[list[str]] = None,
-) -> str:
+) -> dict:
     """Create a recurring task.
 
     Args:
@@ -271,9 +267,7 @@ def create_recurring_task(
         priority: Priority level (optional, default: "medium")
         tags: Tags list (optional)
     """
-    from ..mcp.tools import create_recurring_task as _create_recurring_task
-
-    result = _create_recurring_task(
+    return mcp_tools.create_recurring_task(
         ctx.context.user_id,
         title,
         pattern,
@@ -282,7 +276,6 @@ def create_recurring_task(
         priority,
         tags,
     )
-    return json.dumps(result)
 
 
 SYSTEM_PROMPT = """You are a helpful todo list assistant with advanced task management features.
@@ -314,8 +307,13 @@ Rules:
 """
 
 
+@lru_cache(maxsize=1)
 def _build_agent() -> Agent[ChatContext]:
-    """Build the OpenAI Agent with task tools."""
+    """Build the OpenAI Agent with task tools.
+
+    Built once and shared: the per-user ChatContext is supplied to
+    Runner.run, not stored on the agent.
+    """
     return Agent(
         name="todo_assistant",
         instructions=SYSTEM_PROMPT,
@@ -336,19 +334,23 @@ def _build_agent() -> Agent[ChatContext]:
     )
 
 
-# --- Routes ---
+# --- Turn helpers ---
 
 
-@router.post("/chat", response_model=ChatResponse)
-async def chat(
-    data: ChatRequest,
-    user: CurrentUser = Depends(get_current_user),
-    db: Session = Depends(get_session),
-):
-    """Send a chat message and get an AI response."""
-    import openai
+def _start_turn(
+    db: Session, user: CurrentUser, data: ChatRequest
+) -> tuple[Conversation, Message, list[dict]]:
+    """Resolve the conversation and build the agent input for this turn.
+
+    Nothing is written here; the conversation (if new) and both messages
+    are persisted together by _finish_turn once the agent has replied.
 
-    # Resolve or create conversation
+    Returns:
+        The conversation, the pending user message, and the agent input.
+
+    Raises:
+        HTTPException: 404 if conversation_id does not belong to the user.
+    """
     if data.conversation_id:
         statement = select(Conversation).where(
             Conversation.id == data.conversation_id,
@@ -357,72 +359,82 @@ async def chat(
         conversation = db.exec(statement).first()
         if not conversation:
             raise HTTPException(status_code=404, detail="Conversation not found")
+        # Newest HISTORY_LIMIT messages, flipped back to chronological order.
+        # Only role/content are projected; the agent needs nothing else.
+        history = db.exec(
+            select(Message.role, Message.content)
+            .where(Message.conversation_id == conversation.id)
+            .order_by(Message.created_at.desc())
+            .limit(HISTORY_LIMIT)
+        ).all()
+        input_messages = [
+            {"role": role, "content": content} for role, content in reversed(history)
+        ]
     else:
         conversation = Conversation(user_id=user.id, title="")
-        db.add(conversation)
-        db.commit()
-        db.refresh(conversation)
+        input_messages = []
 
-    # Store user message
     user_message = Message(
         conversation_id=conversation.id,
         user_id=user.id,
         role="user",
         content=data.message,
     )
-    db.add(user_message)
-    db.commit()
-
-    # Load conversation history for context
-    history_stmt = (
-        select(Message)
-        .where(Message.conversation_id == conversation.id)
-        .order_by(Message.created_at)
-    )
-    history = db.exec(history_stmt).all()
-
-    # Build input for agent: convert history to message dicts
-    input_messages = []
-    for msg in history:
-        input_messages.append({"role": msg.role, "content": msg.content})
+    input_messages.append({"role": "user", "content": data.message})
+    return conversation, user_message, input_messages
 
-    # Run agent
-    context = ChatContext(user_id=user.id)
-    agent = _build_agent()
-
-    try:
-        result = await Runner.run(
-            starting_agent=agent,
-            input=input_messages,
-            context=context,
-        )
-    except openai.APIError as e:
-        raise HTTPException(status_code=500, detail=f"AI processing failed: {e}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"AI processing failed: {e}")
 
-    # Extract tool calls from the run result items
+def _extract_tool_calls(result: Any) -> list[dict]:
+    """Collect the function calls the agent made during a run."""
     tool_calls_data = []
     for item in result.raw_responses:
-        if hasattr(item, "output"):
-            for output_item in item.output:
-                if hasattr(output_item, "type") and output_item.type == "function_call":
-                    tool_call_info = {
-                        "tool": output_item.name,
-                        "arguments": json.loads(output_item.arguments)
-                        if isinstance(output_item.arguments, str)
-                        else output_item.arguments,
-                    }
-                    # Try to find the tool result
-                    tool_calls_data.append(tool_call_info)
+        for output_item in getattr(item, "output", ()):
+            if getattr(output_item, "type", None) == "function_call":
+                tool_call_info = {
+                    "tool": output_item.name,
+                    "arguments": orjson.loads(output_item.arguments)
+                    if isinstance(output_item.arguments, str)
+                    else output_item.arguments,
+                }
+                # Try to find the tool result
+                tool_calls_data.append(tool_call_info)
+
+    # Plain answers (no tools used) are the common case
+    if not tool_calls_data:
+        return tool_calls_data
 
     # Extract tool results from new_items
+    by_name: dict[str, list[dict]] = {}
+    for tc in tool_calls_data:
+        by_name.setdefault(tc["tool"], []).append(tc)
     for item in result.new_items:
-        if hasattr(item, "type") and item.type == "tool_call_item":
-            for tc in tool_calls_data:
-                if tc["tool"] == getattr(item, "raw_item", {}).get("name", ""):
-                    if not tc.get("result"):
-                        tc["result"] = {}
+        if getattr(item, "type", None) == "tool_call_item":
+            # raw_item is a response model from the SDK, or a plain dict
+            raw_item = getattr(item, "raw_item", None)
+            if isinstance(raw_item, dict):
+                name = raw_item.get("name", "")
+            else:
+                name = getattr(raw_item, "name", "")
+            for tc in by_name.get(name, ()):
+                if not tc.get("result"):
+                    tc["result"] = {}
+
+    return tool_calls_data
+
+
+def _finish_turn(
+    db: Session,
+    user: CurrentUser,
+    conversation: Conversation,
+    user_message: Message,
+    result: Any,
+) -> tuple[str, list[dict]]:
+    """Persist the conversation and both messages of a completed run.
+
+    Returns:
+        The assistant response text and the tool calls it made.
+    """
+    tool_calls_data = _extract_tool_calls(result)
 
     if result.final_output:
         response_text = str(result.final_output)
@@ -430,11 +442,9 @@ async def chat(
         response_text = "I couldn't process that request."
 
     # Auto-generate title from first message
-    if not conversation.title and data.message:
-        conversation.title = data.message[:100]
-        db.add(conversation)
+    if not conversation.title and user_message.content:
+        conversation.title = user_message.content[:100]
 
-    # Store assistant message
     assistant_message = Message(
         conversation_id=conversation.id,
         user_id=user.id,
@@ -442,13 +452,59 @@ async def chat(
         content=response_text,
         tool_calls=tool_calls_data if tool_calls_data else None,
     )
-    db.add(assistant_message)
 
-    # Update conversation timestamp
+    # Persist the conversation and both messages in one transaction
     conversation.updated_at = datetime.now(timezone.utc)
     db.add(conversation)
+    db.add_all([user_message, assistant_message])
     db.commit()
 
+    return response_text, tool_calls_data
+
+
+def _sse(event: str, data: dict) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+
+# --- Routes ---
+
+
+@router.post("/chat", response_model=ChatResponse)
+async def chat(
+    data: ChatRequest,
+    user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_session),
+):
+    """Send a chat message and get an AI response."""
+    import openai
+
+    conversation, user_message, input_messages = await run_in_threadpool(
+        _start_turn, db, user, data
+    )
+
+    # Run agent
+    context = ChatContext(user_id=user.id)
+    agent = _build_agent()
+
+    try:
+        result = await Runner.run(
+            starting_agent=agent,
+            input=input_messages,
+            context=context,
+        )
+    except openai.APIError as e:
+        raise HTTPException(status_code=500, detail=f"AI processing failed: {e}")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"AI processing failed: {e}")
+
+    response_text, tool_calls_data = await run_in_threadpool(
+        _finish_turn, db, user, conversation, user_message, result
+    )
+    if tool_calls_data:
+        # Tools may have changed the user's tasks behind the REST API
+        await invalidate_tasks(user.id)
+
     return ChatResponse(
         conversation_id=conversation.id,
         response=response_text,
@@ -456,50 +512,162 @@ async def chat(
     )
 
 
-@router.get("/conversations", response_model=ConversationListResponse)
-async def list_conversations(
+@router.post("/chat/stream")
+async def chat_stream(
+    data: ChatRequest,
     user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_session),
 ):
-    """List user's conversations."""
-    statement = (
-        select(Conversation)
-        .where(Conversation.user_id == user.id)
-        .order_by(Conversation.updated_at.desc())
+    """Send a chat message and stream the AI response as server-sent events.
+
+    Emits "delta" events carrying text chunks as the model produces them,
+    then a single "done" event shaped like ChatResponse once the turn has
+    been persisted, or an "error" event if the run fails. As with /chat,
+    nothing is stored for a failed run.
+    """
+    conversation, user_message, input_messages = await run_in_threadpool(
+        _start_turn, db, user, data
     )
-    conversations = db.exec(statement).all()
+    # The request session may be closed before the body is streamed, so the
+    # turn is persisted through a session owned by the generator instead
+    if conversation in db:
+        db.expunge(conversation)
+
+    result = Runner.run_streamed(
+        starting_agent=_build_agent(),
+        input=input_messages,
+        context=ChatContext(user_id=user.id),
+    )
+
+    async def event_stream():
+        try:
+            async for event in result.stream_events():
+                if (
+                    event.type == "raw_response_event"
+                    and event.data.type == "response.output_text.delta"
+                ):
+                    yield _sse("delta", {"content": event.data.delta})
+        except Exception as e:
+            yield _sse("error", {"detail": f"AI processing failed: {e}"})
+            return
+
+        with Session(engine, expire_on_commit=False) as stream_db:
+            response_text, tool_calls_data = await run_in_threadpool(
+                _finish_turn, stream_db, user, conversation, user_message, result
+            )
+        if tool_calls_data:
+            await invalidate_tasks(user.id)
+        yield _sse(
+            "done",
+            {
+                "conversation_id": conversation.id,
+                "response": response_text,
+                "tool_calls": tool_calls_data,
+            },
+        )
 
-    count_stmt = (
-        select(func.count())
-        .select_from(Conversation)
-        .where(Conversation.user_id == user.id)
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
     )
-    total = db.exec(count_stmt).one()
 
-    return ConversationListResponse(conversations=conversations, total=total)
+
+def _encode_cursor(conversation: ConversationRead) -> str:
+    """Opaque list cursor for the position just after conversation."""
+    activity = conversation.updated_at or conversation.created_at
+    raw = f"{activity.isoformat()}|{conversation.id}"
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Inverse of _encode_cursor; 400 on anything malformed."""
+    try:
+        activity, conversation_id = urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(activity), UUID(conversation_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("/conversations", response_model=ConversationListResponse)
+def list_conversations(
+    user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_session),
+    limit: int = Query(default=50, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+):
+    """List user's conversations, most recently active first.
+
+    Pass the previous page's next_cursor as cursor to fetch the next page.
+    """
+    statement = select(
+        Conversation.id,
+        Conversation.title,
+        Conversation.created_at,
+        Conversation.updated_at,
+    ).where(Conversation.user_id == user.id)
+    # Page on (activity, id): id breaks ties between equal timestamps, and
+    # activity falls back to created_at so never-updated rows are not lost
+    keyset = tuple_(CONVERSATION_ACTIVITY, Conversation.id)
+    if cursor is not None:
+        statement = statement.where(keyset < _decode_cursor(cursor))
+    statement = statement.order_by(
+        CONVERSATION_ACTIVITY.desc(), Conversation.id.desc()
+    ).limit(limit)
+    # Rows come straight from our own table, so skip re-validating them
+    conversations = [
+        ConversationRead.model_construct(**row._mapping) for row in db.exec(statement)
+    ]
+
+    next_cursor = None
+    if len(conversations) == limit:
+        next_cursor = _encode_cursor(conversations[-1])
+
+    total = None
+    if include_total:
+        count_stmt = (
+            select(func.count())
+            .select_from(Conversation)
+            .where(Conversation.user_id == user.id)
+        )
+        total = db.exec(count_stmt).one()
+
+    return ConversationListResponse.model_construct(
+        conversations=conversations,
+        total=total,
+        next_cursor=next_cursor,
+    )
 
 
 @router.get("/conversations/{conversation_id}/messages", response_model=MessageListResponse)
-async def get_messages(
+def get_messages(
     conversation_id: UUID,
     user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_session),
 ):
     """Get messages for a conversation."""
-    # Verify conversation ownership
-    conv_stmt = select(Conversation).where(
-        Conversation.id == conversation_id,
-        Conversation.user_id == user.id,
+    # Verify conversation ownership without loading the row
+    owned_stmt = select(
+        exists().where(
+            Conversation.id == conversation_id,
+            Conversation.user_id == user.id,
+        )
     )
-    conversation = db.exec(conv_stmt).first()
-    if not conversation:
+    if not db.exec(owned_stmt).one():
         raise HTTPException(status_code=404, detail="Conversation not found")
 
     msg_stmt = (
-        select(Message)
+        select(
+            Message.id,
+            Message.role,
+            Message.content,
+            Message.tool_calls,
+            Message.created_at,
+        )
         .where(Message.conversation_id == conversation_id)
         .order_by(Message.created_at)
     )
-    messages = db.exec(msg_stmt).all()
+    messages = [MessageRead.model_construct(**row._mapping) for row in db.exec(msg_stmt)]
 
-    return MessageListResponse(messages=messages)
+    return MessageListResponse.model_construct(messages=messages)
@@ -1,21 +1,55 @@
 """Task CRUD routes with Phase V advanced features."""
 
-from datetime import datetime, timedelta, timezone
+import hashlib
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta
 from typing import Literal, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, func, or_, select
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import case, delete, tuple_, update
+from sqlmodel import Session, func, select
 
 from ..auth.jwt import CurrentUser, get_current_user
+from ..cache import get_task_list, invalidate_tasks, set_task_list
 from ..database import get_session
 from ..models import Task, TaskCreate, TaskListResponse, TaskRead, TaskUpdate
+from ..queries import (
+    PRIORITY_ORDER,
+    TITLE_ORDER,
+    calculate_next_due_date,
+    tags_match_any,
+)
 
 router = APIRouter(prefix="/api/v1/tasks", tags=["tasks"])
 
 
+def _get_owned(db: Session, task_id: UUID, user_id: str) -> Optional[Task]:
+    """Primary-key lookup via the session identity map, None unless user_id owns it."""
+    task = db.get(Task, task_id)
+    return task if task and task.user_id == user_id else None
+
+
+def _update_owned(db: Session, task_id: UUID, user_id: str, **values) -> Task:
+    """Write values to user_id's task in one UPDATE ... RETURNING; 404 if not found.
+
+    The database stamps updated_at, so callers that need no current column
+    values skip the SELECT round-trip.
+    """
+    task = db.exec(
+        update(Task)
+        .where(Task.id == task_id, Task.user_id == user_id)
+        .values(**values)
+        .returning(Task)
+    ).scalar_one_or_none()
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+
 @router.get("", response_model=TaskListResponse)
 async def list_tasks(
+    request: Request,
     user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_session),
     # Status filter
@@ -30,11 +64,32 @@ async def list_tasks(
     # Phase V: Sort
     sort: Literal["due_date", "priority", "title", "created_at"] | None = None,
     order: Literal["asc", "desc"] = "desc",
-    # Pagination
+    # Pagination: cursor (creation-time sort only) or offset
     limit: int = Query(default=50, ge=1, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: str | None = None,
 ):
-    """List authenticated user's tasks with filtering, sorting, and search."""
+    """List authenticated user's tasks with filtering, sorting, and search.
+
+    With the default creation-time sort, pass the previous page's
+    next_cursor as cursor to page without OFFSET scans.
+
+    Responses carry an ETag hashed from the body itself, so it changes
+    exactly when the returned page does; a matching If-None-Match gets an
+    empty 304.
+    """
+    cache_key, cached = await get_task_list(user.id, request.url.query)
+    if cached is not None:
+        return _conditional(request, cached)
+
+    # Total and per-status counts in a single aggregate query
+    probe = select(
+        func.count(),
+        func.coalesce(func.sum(case((Task.completed == True, 1), else_=0)), 0),  # noqa: E712
+    ).where(Task.user_id == user.id)
+    total, completed_count = db.exec(probe).one()
+    pending_count = total - completed_count
+
     statement = select(Task).where(Task.user_id == user.id)
 
     # Status filter (new style takes precedence)
@@ -53,19 +108,12 @@ async def list_tasks(
     if tags is not None:
         tag_list = [t.strip() for t in tags.split(",") if t.strip()]
         if tag_list:
-            # Filter tasks that have any of the specified tags
-            # Using JSON contains for each tag with OR
-            tag_conditions = []
-            for tag in tag_list:
-                # SQLAlchemy JSON contains check
-                tag_conditions.append(Task.tags.contains([tag]))
-            if tag_conditions:
-                statement = statement.where(or_(*tag_conditions))
-
-    # Search in title
+            statement = statement.where(tags_match_any(tag_list, db.get_bind().dialect.name))
+
+    # Search in title: ILIKE on PostgreSQL is served by the title trigram index;
+    # SQLAlchemy renders it as lower() LIKE lower() on other dialects
     if search is not None and search.strip():
-        search_term = f"%{search.strip().lower()}%"
-        statement = statement.where(func.lower(Task.title).like(search_term))
+        statement = statement.where(Task.title.ilike(f"%{search.strip()}%"))
 
     # Sorting
     if sort == "due_date":
@@ -75,50 +123,45 @@ async def list_tasks(
         else:
             statement = statement.order_by(Task.due_date.desc().nullslast())
     elif sort == "priority":
-        # Custom priority order: high > medium > low
-        priority_order = func.case(
-            (Task.priority == "high", 1),
-            (Task.priority == "medium", 2),
-            (Task.priority == "low", 3),
-            else_=4,
-        )
         if order == "asc":
-            statement = statement.order_by(priority_order.desc())  # low first
+            statement = statement.order_by(PRIORITY_ORDER.desc())  # low first
         else:
-            statement = statement.order_by(priority_order.asc())  # high first
+            statement = statement.order_by(PRIORITY_ORDER.asc())  # high first
     elif sort == "title":
         if order == "asc":
-            statement = statement.order_by(func.lower(Task.title).asc())
+            statement = statement.order_by(TITLE_ORDER.asc())
         else:
-            statement = statement.order_by(func.lower(Task.title).desc())
+            statement = statement.order_by(TITLE_ORDER.desc())
     else:
-        # Default: created_at
+        # Default: created_at, with id as tie-breaker so the keyset is unique
+        keyset = tuple_(Task.created_at, Task.id)
+        if cursor is not None:
+            after = _decode_cursor(cursor)
+            statement = statement.where(keyset > after if order == "asc" else keyset < after)
         if order == "asc":
-            statement = statement.order_by(Task.created_at.asc())
+            statement = statement.order_by(Task.created_at.asc(), Task.id.asc())
         else:
-            statement = statement.order_by(Task.created_at.desc())
-
-    statement = statement.offset(offset).limit(limit)
-    tasks = db.exec(statement).all()
+            statement = statement.order_by(Task.created_at.desc(), Task.id.desc())
 
-    # Count queries
-    count_base = select(func.count()).select_from(Task).where(Task.user_id == user.id)
-    total = db.exec(count_base).one()
+    if cursor is None:
+        statement = statement.offset(offset)
+    tasks = db.exec(statement.limit(limit)).all()
 
-    pending_count = db.exec(
-        count_base.where(Task.completed == False)
-    ).one()
+    next_cursor = None
+    if sort in (None, "created_at") and len(tasks) == limit:
+        next_cursor = _encode_cursor(tasks[-1])
 
-    completed_count = db.exec(
-        count_base.where(Task.completed == True)
-    ).one()
-
-    return TaskListResponse(
+    result = TaskListResponse(
         tasks=tasks,
         total=total,
         pending_count=pending_count,
         completed_count=completed_count,
+        next_cursor=next_cursor,
     )
+    body = result.model_dump_json().encode()
+    if cache_key is not None:
+        await set_task_list(cache_key, body)
+    return _conditional(request, body)
 
 
 @router.post("", response_model=TaskRead, status_code=201)
@@ -128,39 +171,53 @@ async def create_task(
     db: Session = Depends(get_session),
 ):
     """Create a new task for the authenticated user."""
-    task = Task(
-        user_id=user.id,
-        title=data.title,
-        description=data.description,
-        priority=data.priority,
-        tags=data.tags,
-        due_date=data.due_date,
-        recurring=data.recurring,
-    )
-
-    # Set reminder 1 hour before due date if due_date is set
-    if data.due_date:
-        task.reminder_at = data.due_date - timedelta(hours=1)
-
+    task = _new_task(user.id, data)
     db.add(task)
     db.commit()
-    db.refresh(task)
+    await invalidate_tasks(user.id)
     return task
 
 
+@router.post("/bulk", response_model=list[TaskRead], status_code=201)
+async def bulk_create_tasks(
+    items: list[TaskCreate] = Body(max_length=500),
+    user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_session),
+):
+    """Create many tasks in one transaction, e.g. for imports.
+
+    Rows are flushed together, so SQLAlchemy sends them as a single
+    multi-row INSERT rather than one statement per task.
+    """
+    tasks = [_new_task(user.id, data) for data in items]
+    if not tasks:
+        return []
+
+    db.add_all(tasks)
+    db.commit()
+    await invalidate_tasks(user.id)
+    return tasks
+
+
 @router.get("/{task_id}", response_model=TaskRead)
 async def get_task(
     task_id: UUID,
+    request: Request,
+    response: Response,
     user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_session),
 ):
-    """Get a specific task (must belong to user)."""
-    statement = select(Task).where(Task.id == task_id, Task.user_id == user.id)
-    task = db.exec(statement).first()
+    """Get a specific task (must belong to user); 304 if the client's ETag is current."""
+    task = _get_owned(db, task_id, user.id)
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
+    etag = _etag(task.id, task.updated_at or task.created_at)
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
     return task
 
 
@@ -172,24 +229,15 @@ async def update_task(
     db: Session = Depends(get_session),
 ):
     """Update a task (partial update)."""
-    statement = select(Task).where(Task.id == task_id, Task.user_id == user.id)
-    task = db.exec(statement).first()
-
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
     update_data = data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(task, field, value)
 
     # Update reminder if due_date changed
-    if "due_date" in update_data and data.due_date:
-        task.reminder_at = data.due_date - timedelta(hours=1)
+    if data.due_date:
+        update_data["reminder_at"] = data.due_date - timedelta(hours=1)
 
-    task.updated_at = datetime.now(timezone.utc)
-    db.add(task)
+    task = _update_owned(db, task_id, user.id, **update_data)
     db.commit()
-    db.refresh(task)
+    await invalidate_tasks(user.id)
     return task
 
 
@@ -200,14 +248,15 @@ async def delete_task(
     db: Session = Depends(get_session),
 ):
     """Delete a task."""
-    statement = select(Task).where(Task.id == task_id, Task.user_id == user.id)
-    task = db.exec(statement).first()
+    deleted_id = db.exec(
+        delete(Task).where(Task.id == task_id, Task.user_id == user.id).returning(Task.id)
+    ).scalar_one_or_none()
 
-    if not task:
+    if deleted_id is None:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    db.delete(task)
     db.commit()
+    await invalidate_tasks(user.id)
 
 
 @router.post("/{task_id}/toggle", response_model=TaskRead)
@@ -217,20 +266,108 @@ async def toggle_task(
     db: Session = Depends(get_session),
 ):
     """Toggle task completion status. For recurring tasks, creates next occurrence."""
-    statement = select(Task).where(Task.id == task_id, Task.user_id == user.id)
-    task = db.exec(statement).first()
+    task = _get_owned(db, task_id, user.id)
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
+    next_task = _toggle(task)
+    if next_task:
+        db.add(next_task)
+
+    db.add(task)
+    db.commit()
+    await invalidate_tasks(user.id)
+    return task
+
+
+@router.post("/bulk-toggle", response_model=list[TaskRead])
+async def bulk_toggle_tasks(
+    task_ids: list[UUID] = Body(max_length=100),
+    user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_session),
+):
+    """Toggle many tasks in one transaction.
+
+    IDs that don't exist or belong to another user are skipped. Recurring
+    tasks being completed get their next occurrence, as with toggle.
+    """
+    statement = select(Task).where(Task.id.in_(task_ids), Task.user_id == user.id)
+    tasks = db.exec(statement).all()
+    if not tasks:
+        return []
+
+    next_tasks = [next_task for task in tasks if (next_task := _toggle(task))]
+    db.add_all(tasks)
+    db.add_all(next_tasks)
+    db.commit()
+    await invalidate_tasks(user.id)
+    return tasks
+
+
+def _etag(*parts) -> str:
+    """Strong ETag over the values a response depends on."""
+    digest = hashlib.sha256("|".join(map(str, parts)).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def _conditional(request: Request, body: bytes) -> Response:
+    """JSON response for body with its ETag, or an empty 304 if the client has it."""
+    etag = f'"{hashlib.sha256(body).hexdigest()}"'
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match already names etag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    return header.strip() == "*" or etag in (
+        tag.strip().removeprefix("W/") for tag in header.split(",")
+    )
+
+
+def _encode_cursor(task: Task) -> str:
+    """Opaque list cursor for the position just after task."""
+    raw = f"{task.created_at.isoformat()}|{task.id}"
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Inverse of _encode_cursor; 400 on anything malformed."""
+    try:
+        created_at, task_id = urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(task_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _new_task(user_id: str, data: TaskCreate) -> Task:
+    """Build an unsaved task from create input, reminder included."""
+    return Task(
+        user_id=user_id,
+        title=data.title,
+        description=data.description,
+        priority=data.priority,
+        tags=data.tags,
+        due_date=data.due_date,
+        # Set reminder 1 hour before due date if due_date is set
+        reminder_at=data.due_date - timedelta(hours=1) if data.due_date else None,
+        recurring=data.recurring,
+    )
+
+
+def _toggle(task: Task) -> Optional[Task]:
+    """Flip task's completion; return the next occurrence if one is due."""
     task.completed = not task.completed
-    task.updated_at = datetime.now(timezone.utc)
 
     # Handle recurring task completion
     if task.completed and task.recurring and task.due_date:
         next_due_date = calculate_next_due_date(task.due_date, task.recurring)
-        next_task = Task(
-            user_id=user.id,
+        return Task(
+            user_id=task.user_id,
             title=task.title,
             description=task.description,
             priority=task.priority,
@@ -240,24 +377,7 @@ async def toggle_task(
             recurring=task.recurring,
             recurring_parent_id=task.id,
         )
-        db.add(next_task)
-
-    db.add(task)
-    db.commit()
-    db.refresh(task)
-    return task
-
-
-def calculate_next_due_date(current_due: datetime, pattern: str) -> datetime:
-    """Calculate the next due date based on recurring pattern."""
-    if pattern == "daily":
-        return current_due + timedelta(days=1)
-    elif pattern == "weekly":
-        return current_due + timedelta(weeks=1)
-    elif pattern == "monthly":
-        # Add roughly a month (30 days)
-        return current_due + timedelta(days=30)
-    return current_due
+    return None
 
 
 # --- Phase V: Additional Endpoints ---
@@ -271,17 +391,9 @@ async def update_priority(
     db: Session = Depends(get_session),
 ):
     """Update task priority."""
-    statement = select(Task).where(Task.id == task_id, Task.user_id == user.id)
-    task = db.exec(statement).first()
-
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
-    task.priority = priority
-    task.updated_at = datetime.now(timezone.utc)
-    db.add(task)
+    task = _update_owned(db, task_id, user.id, priority=priority)
     db.commit()
-    db.refresh(task)
+    await invalidate_tasks(user.id)
     return task
 
 
@@ -294,28 +406,30 @@ async def update_tags(
     db: Session = Depends(get_session),
 ):
     """Update task tags."""
-    statement = select(Task).where(Task.id == task_id, Task.user_id == user.id)
-    task = db.exec(statement).first()
+    task = _get_owned(db, task_id, user.id)
 
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
     current_tags = list(task.tags) if task.tags else []
 
+    # Set lookups keep add/remove linear in the number of tags
     if action == "add":
+        seen = set(current_tags)
         for tag in tags:
-            if tag not in current_tags:
+            if tag not in seen:
+                seen.add(tag)
                 current_tags.append(tag)
     elif action == "remove":
-        current_tags = [t for t in current_tags if t not in tags]
+        to_remove = set(tags)
+        current_tags = [t for t in current_tags if t not in to_remove]
     elif action == "replace":
         current_tags = tags
 
     task.tags = current_tags
-    task.updated_at = datetime.now(timezone.utc)
     db.add(task)
     db.commit()
-    db.refresh(task)
+    await invalidate_tasks(user.id)
     return task
 
 
@@ -329,21 +443,12 @@ async def update_due_date(
     db: Session = Depends(get_session),
 ):
     """Update task due date and optionally set reminder."""
-    statement = select(Task).where(Task.id == task_id, Task.user_id == user.id)
-    task = db.exec(statement).first()
-
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-
-    task.due_date = due_date
-
     if due_date and set_reminder:
-        task.reminder_at = due_date - timedelta(minutes=reminder_minutes_before)
+        reminder_at = due_date - timedelta(minutes=reminder_minutes_before)
     else:
-        task.reminder_at = None
+        reminder_at = None
 
-    task.updated_at = datetime.now(timezone.utc)
-    db.add(task)
+    task = _update_owned(db, task_id, user.id, due_date=due_date, reminder_at=reminder_at)
     db.commit()
-    db.refresh(task)
+    await invalidate_tasks(user.id)
     return task
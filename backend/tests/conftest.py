@@ -1,17 +1,36 @@
 """Test configuration and fixtures."""
 
+import jwt
 import pytest
-from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 from sqlalchemy.pool import StaticPool
 from sqlmodel import Session, SQLModel, create_engine
 
+from todo_api.auth.jwt import CurrentUser
+from todo_api.config import settings
 from todo_api.database import get_session
 from todo_api.main import app
 
+TEST_USER = CurrentUser(id="test-user-id-123", email="test@example.com")
+TEST_USER_2 = CurrentUser(id="test-user-id-456", email="other@example.com")
 
-@pytest.fixture(name="engine")
+# Signed once at import; tokens carry no expiry so they stay valid
+_TOKENS = {
+    user.id: jwt.encode(
+        {"sub": user.id, "email": user.email}, settings.BETTER_AUTH_SECRET, algorithm="HS256"
+    )
+    for user in (TEST_USER, TEST_USER_2)
+}
+
+
+def make_auth_header(user: CurrentUser = TEST_USER) -> dict:
+    """Create an Authorization header with a valid JWT for the given user."""
+    return {"Authorization": f"Bearer {_TOKENS[user.id]}"}
+
+
+@pytest.fixture(name="engine", scope="session")
 def engine_fixture():
-    """Create an in-memory SQLite engine for testing."""
+    """Create an in-memory SQLite engine for testing (schema built once per run)."""
     engine = create_engine(
         "sqlite://",
         connect_args={"check_same_thread": False},
@@ -21,21 +40,41 @@ def engine_fixture():
     return engine
 
 
+@pytest.fixture(autouse=True)
+def clean_tables(engine):
+    """Empty every table before each test so tests stay isolated."""
+    with engine.begin() as conn:
+        for table in reversed(SQLModel.metadata.sorted_tables):
+            conn.execute(table.delete())
+
+
 @pytest.fixture(name="session")
 def session_fixture(engine):
-    """Create a database session for testing."""
-    with Session(engine) as session:
+    """Create a database session for testing, configured like get_session."""
+    with Session(engine, expire_on_commit=False) as session:
         yield session
 
 
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """Run async tests and fixtures on asyncio."""
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+async def shared_client():
+    """One AsyncClient calling the app in-process, on one event loop, for every test."""
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
 @pytest.fixture(name="client")
-def client_fixture(session):
-    """Create a test client with overridden dependencies."""
+def client_fixture(session, shared_client):
+    """Return the shared test client wired to this test's session."""
 
     def get_session_override():
         yield session
 
     app.dependency_overrides[get_session] = get_session_override
-    client = TestClient(app)
-    yield client
+    yield shared_client
     app.dependency_overrides.clear()
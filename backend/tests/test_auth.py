@@ -0,0 +1,115 @@
+"""Tests for JWT validation and the verified-token cache."""
+
+import hashlib
+import time
+from types import SimpleNamespace
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from todo_api.auth import jwt as auth_jwt
+from todo_api.config import settings
+
+from .conftest import TEST_USER, make_auth_header
+
+NOW = 1_700_000_000.0
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Start and end each test with an empty token cache."""
+    auth_jwt._token_cache.clear()
+    yield
+    auth_jwt._token_cache.clear()
+
+
+@pytest.fixture(name="clock")
+def clock_fixture(monkeypatch):
+    """Freeze the cache's clock at NOW; tests move it via clock.now."""
+    clock = SimpleNamespace(now=NOW)
+    monkeypatch.setattr(auth_jwt, "time", SimpleNamespace(time=lambda: clock.now))
+    return clock
+
+
+def _token(**claims) -> str:
+    payload = {"sub": TEST_USER.id, "email": TEST_USER.email, **claims}
+    return jwt.encode(payload, settings.BETTER_AUTH_SECRET, algorithm="HS256")
+
+
+def _expires_at(token: str) -> float:
+    return auth_jwt._token_cache[hashlib.sha256(token.encode()).digest()][0]
+
+
+def test_cache_hit_skips_verification(clock, monkeypatch):
+    """A repeat token is served from the cache without decoding it again."""
+    token = _token()
+    payload, user = auth_jwt._authenticate(token)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cached token was decoded again")
+
+    monkeypatch.setattr(auth_jwt.jwt, "decode", fail)
+    assert auth_jwt._authenticate(token) == (payload, user)
+    assert auth_jwt._authenticate(token)[1] is user
+
+
+def test_cache_ttl_clamped_to_exp(clock):
+    """Entries never outlive the token's exp, less the safety margin."""
+    long_lived = _token(exp=int(time.time()) + 3600)
+    auth_jwt._authenticate(long_lived)
+    assert _expires_at(long_lived) == NOW + auth_jwt._CACHE_TTL
+
+    clock.now = time.time()
+    short_lived = _token(exp=int(clock.now) + 10)
+    auth_jwt._authenticate(short_lived)
+    assert _expires_at(short_lived) == int(clock.now) + 10 - auth_jwt._CACHE_EXP_MARGIN
+
+
+def test_cache_skips_token_inside_exp_margin():
+    """A token about to expire is accepted but not cached."""
+    auth_jwt._authenticate(_token(exp=int(time.time()) + 2))
+    assert auth_jwt._token_cache == {}
+
+
+def test_cache_evicts_oldest_at_size_cap(clock, monkeypatch):
+    """At the size cap the oldest entry makes room for the new one."""
+    monkeypatch.setattr(auth_jwt, "_CACHE_MAXSIZE", 2)
+    tokens = [_token(n=n) for n in range(3)]
+    for token in tokens:
+        auth_jwt._authenticate(token)
+
+    keys = [hashlib.sha256(t.encode()).digest() for t in tokens]
+    assert list(auth_jwt._token_cache) == keys[1:]
+
+
+def test_expired_cached_token_rejected():
+    """Once its cache entry lapses, an expired token fails verification."""
+    now = time.time()
+    token = _token(exp=int(now) - 10)
+    key = hashlib.sha256(token.encode()).digest()
+    payload = jwt.decode(
+        token,
+        settings.BETTER_AUTH_SECRET,
+        algorithms=["HS256"],
+        options={"verify_exp": False},
+    )
+    # Cached while the token was still valid, long enough ago to have lapsed
+    auth_jwt._cache_result(key, payload, TEST_USER, now - 100)
+
+    with pytest.raises(HTTPException) as exc_info:
+        auth_jwt._authenticate(token)
+    assert exc_info.value.status_code == 401
+    assert exc_info.value.detail == "Token has expired"
+    assert key not in auth_jwt._token_cache
+
+
+@pytest.mark.anyio
+async def test_invalid_token_fixed_detail(client):
+    """Invalid tokens get a fixed 401 detail that does not echo PyJWT's reason."""
+    response = await client.get("/api/v1/tasks", headers={"Authorization": "Bearer not.a.jwt"})
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Invalid authentication token"
+
+    response = await client.get("/api/v1/tasks", headers=make_auth_header())
+    assert response.status_code == 200
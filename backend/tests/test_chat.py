@@ -0,0 +1,49 @@
+"""Tests for conversation endpoints."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from todo_api.models import Conversation
+
+from .conftest import TEST_USER, make_auth_header
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_list_conversations_cursor_pagination(client, session):
+    """Paging covers tied timestamps and never-updated conversations exactly once."""
+    same_time = datetime(2024, 1, 15, 10, 30, tzinfo=timezone.utc)
+    conversations = [
+        Conversation(user_id=TEST_USER.id, title="Tied A", updated_at=same_time),
+        Conversation(user_id=TEST_USER.id, title="Tied B", updated_at=same_time),
+        Conversation(
+            user_id=TEST_USER.id,
+            title="Never updated",
+            created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        ),
+    ]
+    session.add_all(conversations)
+    session.commit()
+
+    headers = make_auth_header()
+    seen = []
+    params = {"limit": 1}
+    while True:
+        response = await client.get("/api/v1/conversations", params=params, headers=headers)
+        data = response.json()
+        seen.extend(c["title"] for c in data["conversations"])
+        if not data["next_cursor"]:
+            break
+        params["cursor"] = data["next_cursor"]
+
+    assert sorted(seen[:2]) == ["Tied A", "Tied B"]
+    assert seen[2:] == ["Never updated"]
+
+
+async def test_list_conversations_invalid_cursor(client):
+    """A malformed cursor is rejected with 400."""
+    response = await client.get(
+        "/api/v1/conversations", params={"cursor": "not-a-cursor"}, headers=make_auth_header()
+    )
+    assert response.status_code == 400
@@ -0,0 +1,37 @@
+"""Tests for shared task query helpers."""
+
+from datetime import datetime
+
+import pytest
+
+from todo_api.queries import calculate_next_due_date
+
+
+@pytest.mark.parametrize(
+    ("current", "expected"),
+    [
+        # Clamped to the last day of a leap-year February
+        (datetime(2024, 1, 31, 9, 0), datetime(2024, 2, 29, 9, 0)),
+        # ... and of a common-year February
+        (datetime(2023, 1, 31, 9, 0), datetime(2023, 2, 28, 9, 0)),
+        # December rolls over into January of the next year
+        (datetime(2023, 12, 15, 9, 0), datetime(2024, 1, 15, 9, 0)),
+        (datetime(2023, 12, 31, 9, 0), datetime(2024, 1, 31, 9, 0)),
+    ],
+)
+def test_monthly_next_due_date(current, expected):
+    """Monthly recurrence steps one calendar month, clamping the day."""
+    assert calculate_next_due_date(current, "monthly") == expected
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [
+        ("daily", datetime(2024, 3, 1, 9, 0)),
+        ("weekly", datetime(2024, 3, 7, 9, 0)),
+        ("unknown", datetime(2024, 2, 29, 9, 0)),
+    ],
+)
+def test_fixed_next_due_date(pattern, expected):
+    """Daily and weekly add fixed steps; unknown patterns keep the date."""
+    assert calculate_next_due_date(datetime(2024, 2, 29, 9, 0), pattern) == expected
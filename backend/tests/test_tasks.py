@@ -1,34 +1,24 @@
 """Tests for task CRUD endpoints."""
 
-import jwt
 import pytest
 
-from todo_api.auth.jwt import CurrentUser
-from todo_api.config import settings
+from .conftest import TEST_USER, TEST_USER_2, make_auth_header
 
-TEST_USER = CurrentUser(id="test-user-id-123", email="test@example.com")
-TEST_USER_2 = CurrentUser(id="test-user-id-456", email="other@example.com")
+pytestmark = pytest.mark.anyio
 
 
-def make_auth_header(user: CurrentUser = TEST_USER) -> dict:
-    """Create an Authorization header with a valid JWT for the given user."""
-    payload = {"sub": user.id, "email": user.email}
-    token = jwt.encode(payload, settings.BETTER_AUTH_SECRET, algorithm="HS256")
-    return {"Authorization": f"Bearer {token}"}
-
-
-def test_health_check(client):
+async def test_health_check(client):
     """AC-21: Health check returns healthy status."""
-    response = client.get("/api/v1/health")
+    response = await client.get("/api/v1/health")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
 
 
-def test_create_task(client):
+async def test_create_task(client):
     """AC-6: Create a task with valid data."""
     headers = make_auth_header()
-    response = client.post(
+    response = await client.post(
         "/api/v1/tasks",
         json={"title": "Buy groceries", "description": "Milk, eggs, bread"},
         headers=headers,
@@ -42,10 +32,10 @@ def test_create_task(client):
     assert "created_at" in data
 
 
-def test_create_task_title_only(client):
+async def test_create_task_title_only(client):
     """Create a task with title only (description optional)."""
     headers = make_auth_header()
-    response = client.post(
+    response = await client.post(
         "/api/v1/tasks",
         json={"title": "Simple task"},
         headers=headers,
@@ -56,10 +46,27 @@ def test_create_task_title_only(client):
     assert data["description"] == ""
 
 
-def test_create_task_empty_title_fails(client):
+async def test_bulk_create_tasks(client):
+    """Create several tasks in one request."""
+    headers = make_auth_header()
+    response = await client.post(
+        "/api/v1/tasks/bulk",
+        json=[{"title": "Import 1"}, {"title": "Import 2", "priority": "high"}],
+        headers=headers,
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert [t["title"] for t in data] == ["Import 1", "Import 2"]
+    assert data[1]["priority"] == "high"
+
+    response = await client.get("/api/v1/tasks", headers=headers)
+    assert response.json()["total"] == 2
+
+
+async def test_create_task_empty_title_fails(client):
     """AC-20: Validation error for empty title."""
     headers = make_auth_header()
-    response = client.post(
+    response = await client.post(
         "/api/v1/tasks",
         json={"title": ""},
         headers=headers,
@@ -67,83 +74,164 @@ def test_create_task_empty_title_fails(client):
     assert response.status_code == 422
 
 
-def test_create_task_no_auth_fails(client):
+async def test_create_task_no_auth_fails(client):
     """AC-5: Unauthenticated requests return 401/403."""
-    response = client.post(
+    response = await client.post(
         "/api/v1/tasks",
         json={"title": "Unauthorized task"},
     )
     assert response.status_code in (401, 403)
 
 
-def test_list_tasks(client):
+async def test_list_tasks(client):
     """AC-7: List tasks for authenticated user."""
     headers = make_auth_header()
     # Create two tasks
-    client.post("/api/v1/tasks", json={"title": "Task 1"}, headers=headers)
-    client.post("/api/v1/tasks", json={"title": "Task 2"}, headers=headers)
+    await client.post("/api/v1/tasks", json={"title": "Task 1"}, headers=headers)
+    await client.post("/api/v1/tasks", json={"title": "Task 2"}, headers=headers)
 
-    response = client.get("/api/v1/tasks", headers=headers)
+    response = await client.get("/api/v1/tasks", headers=headers)
     assert response.status_code == 200
     data = response.json()
     assert data["total"] == 2
     assert len(data["tasks"]) == 2
 
 
-def test_list_tasks_filter_completed(client):
+async def test_list_tasks_cursor_pagination(client):
+    """Pages chained through next_cursor cover every task exactly once."""
+    headers = make_auth_header()
+    for i in range(5):
+        await client.post("/api/v1/tasks", json={"title": f"Task {i}"}, headers=headers)
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        response = await client.get("/api/v1/tasks", params=params, headers=headers)
+        data = response.json()
+        seen.extend(t["title"] for t in data["tasks"])
+        if not data["next_cursor"]:
+            break
+        params["cursor"] = data["next_cursor"]
+
+    assert seen == [f"Task {i}" for i in reversed(range(5))]
+
+
+async def test_list_tasks_filter_completed(client):
     """AC-7: Filter tasks by completion status."""
     headers = make_auth_header()
     # Create a task and toggle it
-    resp = client.post("/api/v1/tasks", json={"title": "Done task"}, headers=headers)
+    resp = await client.post("/api/v1/tasks", json={"title": "Done task"}, headers=headers)
     task_id = resp.json()["id"]
-    client.post(f"/api/v1/tasks/{task_id}/toggle", headers=headers)
+    await client.post(f"/api/v1/tasks/{task_id}/toggle", headers=headers)
 
-    client.post("/api/v1/tasks", json={"title": "Pending task"}, headers=headers)
+    await client.post("/api/v1/tasks", json={"title": "Pending task"}, headers=headers)
 
     # Filter completed
-    response = client.get("/api/v1/tasks?completed=true", headers=headers)
+    response = await client.get("/api/v1/tasks?completed=true", headers=headers)
     data = response.json()
     assert data["total"] == 1
     assert data["tasks"][0]["completed"] is True
 
     # Filter pending
-    response = client.get("/api/v1/tasks?completed=false", headers=headers)
+    response = await client.get("/api/v1/tasks?completed=false", headers=headers)
     data = response.json()
     assert data["total"] == 1
     assert data["tasks"][0]["completed"] is False
 
 
-def test_get_task(client):
+async def test_list_tasks_filter_tags(client):
+    """Tag filter matches tasks having any of the given tags."""
+    headers = make_auth_header()
+    await client.post("/api/v1/tasks", json={"title": "Work", "tags": ["work"]}, headers=headers)
+    await client.post(
+        "/api/v1/tasks", json={"title": "Both", "tags": ["home", "urgent"]}, headers=headers
+    )
+    await client.post("/api/v1/tasks", json={"title": "Untagged"}, headers=headers)
+
+    response = await client.get("/api/v1/tasks?tags=work,urgent", headers=headers)
+    titles = {t["title"] for t in response.json()["tasks"]}
+    assert titles == {"Work", "Both"}
+
+
+async def test_list_tasks_sort_priority(client):
+    """Priority sort puts high first by default and low first ascending."""
+    headers = make_auth_header()
+    for priority in ("low", "high", "medium"):
+        await client.post(
+            "/api/v1/tasks", json={"title": priority, "priority": priority}, headers=headers
+        )
+
+    response = await client.get("/api/v1/tasks?sort=priority", headers=headers)
+    assert [t["priority"] for t in response.json()["tasks"]] == ["high", "medium", "low"]
+
+    response = await client.get("/api/v1/tasks?sort=priority&order=asc", headers=headers)
+    assert [t["priority"] for t in response.json()["tasks"]] == ["low", "medium", "high"]
+
+
+async def test_list_tasks_etag(client):
+    """A matching If-None-Match gets 304 until the user's tasks change."""
+    headers = make_auth_header()
+    await client.post("/api/v1/tasks", json={"title": "Task 1"}, headers=headers)
+
+    response = await client.get("/api/v1/tasks", headers=headers)
+    etag = response.headers["ETag"]
+
+    response = await client.get("/api/v1/tasks", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    await client.post("/api/v1/tasks", json={"title": "Task 2"}, headers=headers)
+    response = await client.get("/api/v1/tasks", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+async def test_list_tasks_etag_changes_on_older_task_edit(client):
+    """Editing a task other than the newest still changes the list ETag."""
+    headers = make_auth_header()
+    resp = await client.post("/api/v1/tasks", json={"title": "Older"}, headers=headers)
+    older_id = resp.json()["id"]
+    await client.post("/api/v1/tasks", json={"title": "Newer"}, headers=headers)
+
+    etag = (await client.get("/api/v1/tasks", headers=headers)).headers["ETag"]
+    await client.patch(f"/api/v1/tasks/{older_id}", json={"title": "Renamed"}, headers=headers)
+
+    response = await client.get("/api/v1/tasks", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert "Renamed" in {t["title"] for t in response.json()["tasks"]}
+
+
+async def test_get_task(client):
     """AC-7: Get a specific task by ID."""
     headers = make_auth_header()
-    resp = client.post("/api/v1/tasks", json={"title": "My task"}, headers=headers)
+    resp = await client.post("/api/v1/tasks", json={"title": "My task"}, headers=headers)
     task_id = resp.json()["id"]
 
-    response = client.get(f"/api/v1/tasks/{task_id}", headers=headers)
+    response = await client.get(f"/api/v1/tasks/{task_id}", headers=headers)
     assert response.status_code == 200
     assert response.json()["title"] == "My task"
 
 
-def test_get_task_not_found(client):
+async def test_get_task_not_found(client):
     """AC-20: 404 for non-existent task."""
     headers = make_auth_header()
-    response = client.get(
+    response = await client.get(
         "/api/v1/tasks/00000000-0000-0000-0000-000000000000", headers=headers
     )
     assert response.status_code == 404
 
 
-def test_update_task(client):
+async def test_update_task(client):
     """AC-8: Update task title and description."""
     headers = make_auth_header()
-    resp = client.post(
+    resp = await client.post(
         "/api/v1/tasks",
         json={"title": "Original", "description": "Old desc"},
         headers=headers,
     )
     task_id = resp.json()["id"]
 
-    response = client.patch(
+    response = await client.patch(
         f"/api/v1/tasks/{task_id}",
         json={"title": "Updated", "description": "New desc"},
         headers=headers,
@@ -155,17 +243,17 @@ def test_update_task(client):
     assert data["updated_at"] is not None
 
 
-def test_update_task_partial(client):
+async def test_update_task_partial(client):
     """AC-8: Partial update - only title."""
     headers = make_auth_header()
-    resp = client.post(
+    resp = await client.post(
         "/api/v1/tasks",
         json={"title": "Original", "description": "Keep me"},
         headers=headers,
     )
     task_id = resp.json()["id"]
 
-    response = client.patch(
+    response = await client.patch(
         f"/api/v1/tasks/{task_id}",
         json={"title": "New title"},
         headers=headers,
@@ -176,67 +264,88 @@ def test_update_task_partial(client):
     assert data["description"] == "Keep me"
 
 
-def test_delete_task(client):
+async def test_delete_task(client):
     """AC-9: Delete a task."""
     headers = make_auth_header()
-    resp = client.post("/api/v1/tasks", json={"title": "Delete me"}, headers=headers)
+    resp = await client.post("/api/v1/tasks", json={"title": "Delete me"}, headers=headers)
     task_id = resp.json()["id"]
 
-    response = client.delete(f"/api/v1/tasks/{task_id}", headers=headers)
+    response = await client.delete(f"/api/v1/tasks/{task_id}", headers=headers)
     assert response.status_code == 204
 
     # Verify it's gone
-    response = client.get(f"/api/v1/tasks/{task_id}", headers=headers)
+    response = await client.get(f"/api/v1/tasks/{task_id}", headers=headers)
     assert response.status_code == 404
 
 
-def test_toggle_task(client):
+async def test_toggle_task(client):
     """AC-10: Toggle task completion."""
     headers = make_auth_header()
-    resp = client.post("/api/v1/tasks", json={"title": "Toggle me"}, headers=headers)
+    resp = await client.post("/api/v1/tasks", json={"title": "Toggle me"}, headers=headers)
     task_id = resp.json()["id"]
     assert resp.json()["completed"] is False
 
     # Toggle to completed
-    response = client.post(f"/api/v1/tasks/{task_id}/toggle", headers=headers)
+    response = await client.post(f"/api/v1/tasks/{task_id}/toggle", headers=headers)
     assert response.status_code == 200
     assert response.json()["completed"] is True
 
     # Toggle back to pending
-    response = client.post(f"/api/v1/tasks/{task_id}/toggle", headers=headers)
+    response = await client.post(f"/api/v1/tasks/{task_id}/toggle", headers=headers)
     assert response.status_code == 200
     assert response.json()["completed"] is False
 
 
-def test_data_isolation(client):
+async def test_bulk_toggle_tasks(client):
+    """Toggle several tasks at once, skipping other users' tasks."""
+    headers = make_auth_header()
+    ids = []
+    for title in ("First", "Second"):
+        resp = await client.post("/api/v1/tasks", json={"title": title}, headers=headers)
+        ids.append(resp.json()["id"])
+    resp = await client.post(
+        "/api/v1/tasks", json={"title": "Not mine"}, headers=make_auth_header(TEST_USER_2)
+    )
+    other_id = resp.json()["id"]
+
+    response = await client.post(
+        "/api/v1/tasks/bulk-toggle", json=[*ids, other_id], headers=headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert sorted(t["id"] for t in data) == sorted(ids)
+    assert all(t["completed"] is True for t in data)
+
+
+async def test_data_isolation(client):
     """AC-11: User A cannot see User B's tasks."""
     headers_a = make_auth_header(TEST_USER)
     headers_b = make_auth_header(TEST_USER_2)
 
     # User A creates a task
-    resp = client.post("/api/v1/tasks", json={"title": "A's task"}, headers=headers_a)
+    resp = await client.post("/api/v1/tasks", json={"title": "A's task"}, headers=headers_a)
     task_id = resp.json()["id"]
 
     # User B cannot see it
-    response = client.get(f"/api/v1/tasks/{task_id}", headers=headers_b)
+    response = await client.get(f"/api/v1/tasks/{task_id}", headers=headers_b)
     assert response.status_code == 404
 
     # User B's list doesn't include it
-    response = client.get("/api/v1/tasks", headers=headers_b)
+    response = await client.get("/api/v1/tasks", headers=headers_b)
     assert response.json()["total"] == 0
 
 
-def test_data_isolation_delete(client):
+async def test_data_isolation_delete(client):
     """AC-11: User B cannot delete User A's tasks."""
     headers_a = make_auth_header(TEST_USER)
     headers_b = make_auth_header(TEST_USER_2)
 
-    resp = client.post("/api/v1/tasks", json={"title": "Protected"}, headers=headers_a)
+    resp = await client.post("/api/v1/tasks", json={"title": "Protected"}, headers=headers_a)
     task_id = resp.json()["id"]
 
-    response = client.delete(f"/api/v1/tasks/{task_id}", headers=headers_b)
+    response = await client.delete(f"/api/v1/tasks/{task_id}", headers=headers_b)
     assert response.status_code == 404
 
     # Task still exists for User A
-    response = client.get(f"/api/v1/tasks/{task_id}", headers=headers_a)
+    response = await client.get(f"/api/v1/tasks/{task_id}", headers=headers_a)
     assert response.status_code == 200
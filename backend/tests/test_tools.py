@@ -0,0 +1,52 @@
+"""Tests for the agent's MCP task tools."""
+
+import pytest
+
+from todo_api.mcp import tools
+from todo_api.models import Task
+
+from .conftest import TEST_USER
+
+USER_ID = TEST_USER.id
+MISSING_ID = "00000000-0000-0000-0000-000000000000"
+
+
+@pytest.fixture(autouse=True)
+def tools_engine(engine, monkeypatch):
+    """Point the tools, which open their own sessions, at the test database."""
+    monkeypatch.setattr(tools, "engine", engine)
+
+
+@pytest.fixture(name="task_id")
+def task_id_fixture(session):
+    """A task owned by USER_ID with one tag."""
+    task = Task(user_id=USER_ID, title="Tagged", tags=["work"])
+    session.add(task)
+    session.commit()
+    return str(task.id)
+
+
+def test_add_tag(task_id):
+    """add_tag appends a new tag once and leaves an existing one alone."""
+    result = tools.add_tag(USER_ID, task_id, "urgent")
+    assert result["status"] == "updated"
+    assert result["tags"] == ["work", "urgent"]
+
+    result = tools.add_tag(USER_ID, task_id, "urgent")
+    assert result["tags"] == ["work", "urgent"]
+
+
+def test_remove_tag(task_id):
+    """remove_tag drops a present tag and ignores an absent one."""
+    result = tools.remove_tag(USER_ID, task_id, "work")
+    assert result["status"] == "updated"
+    assert result["tags"] == []
+
+    result = tools.remove_tag(USER_ID, task_id, "work")
+    assert result["tags"] == []
+
+
+def test_tag_tools_task_not_found(task_id):
+    """Tag tools report missing tasks and other users' tasks as not found."""
+    assert tools.add_tag(USER_ID, MISSING_ID, "x") == {"error": "Task not found"}
+    assert tools.remove_tag("someone-else", task_id, "work") == {"error": "Task not found"}
@@ -82,6 +82,7 @@ export async function getTasks(
   // Pagination
   if (params?.limit) searchParams.set("limit", String(params.limit));
   if (params?.offset) searchParams.set("offset", String(params.offset));
+  if (params?.cursor) searchParams.set("cursor", params.cursor);
 
   const query = searchParams.toString();
   const response = await fetchWithAuth(`/tasks${query ? `?${query}` : ""}`);
@@ -45,6 +45,7 @@ export interface TaskListResponse {
   total: number;
   pending_count: number;
   completed_count: number;
+  next_cursor: string | null;
 }
 
 // Phase V: Task filter params
@@ -57,6 +58,7 @@ export interface TaskFilterParams {
   order?: "asc" | "desc";
   limit?: number;
   offset?: number;
+  cursor?: string;
 }
 
 // Phase III: Chat types
@@ -90,7 +92,8 @@ export interface ChatMessage {
 
 export interface ConversationListResponse {
   conversations: Conversation[];
-  total: number;
+  total: number | null;
+  next_cursor: string | null;
 }
 
 export interface MessageListResponse {
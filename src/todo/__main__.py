@@ -36,6 +36,15 @@ class TodoApp:
         """Initialize the application."""
         self.manager = TaskManager()
         self.running = True
+        # Menu choice -> handler, built once rather than on every prompt
+        self._actions = {
+            "1": self._add_task,
+            "2": self._view_tasks,
+            "3": self._update_task,
+            "4": self._delete_task,
+            "5": self._mark_complete,
+            "0": self._exit,
+        }
 
     def run(self) -> None:
         """Main application loop."""
@@ -56,16 +65,7 @@ class TodoApp:
         """Handle user menu selection."""
         choice = get_input("Enter your choice")
 
-        actions = {
-            "1": self._add_task,
-            "2": self._view_tasks,
-            "3": self._update_task,
-            "4": self._delete_task,
-            "5": self._mark_complete,
-            "0": self._exit,
-        }
-
-        action = actions.get(choice)
+        action = self._actions.get(choice)
         if action:
             action()
         else:
@@ -113,7 +113,7 @@ class TodoApp:
         show_header("Your Tasks")
 
         tasks = self.manager.get_all()
-        show_task_list(tasks, show_summary=True)
+        show_task_list(tasks, show_summary=True, stats=self.manager.get_stats())
 
     def _update_task(self) -> None:
         """Update an existing task (Feature F3).
@@ -4,6 +4,7 @@ This module provides the TaskManager class that handles all CRUD operations
 as specified in specs/phase1/data-model.md section 3.
 """
 
+from collections.abc import KeysView
 from datetime import datetime
 
 from .models import Task
@@ -18,12 +19,17 @@ class TaskManager:
     Attributes:
         _tasks: Dictionary mapping task IDs to Task objects
         _next_id: Counter for generating unique task IDs
+        _sorted_cache: Cached result of get_all (None when stale)
+        _completed_count: Number of completed tasks, kept up to date by
+            toggle_complete and delete so get_stats needs no scan
     """
 
     def __init__(self) -> None:
         """Initialize an empty task manager."""
         self._tasks: dict[int, Task] = {}
         self._next_id: int = 1
+        self._sorted_cache: list[Task] | None = None
+        self._completed_count: int = 0
 
     def add(self, title: str, description: str = "") -> Task:
         """Create and store a new task.
@@ -45,16 +51,23 @@ class TaskManager:
         )
         self._tasks[task.id] = task
         self._next_id += 1
+        self._sorted_cache = None
         return task
 
     def get_all(self) -> list[Task]:
         """Return all tasks ordered by ID.
 
+        IDs are assigned in increasing order and never reused, so the dict's
+        insertion order is already ID order and no sort is needed. The list
+        is cached until a task is added or deleted; callers must not modify it.
+
         Returns:
             List of all tasks, sorted by ID (ascending)
             Returns empty list if no tasks exist
         """
-        return sorted(self._tasks.values(), key=lambda t: t.id)
+        if self._sorted_cache is None:
+            self._sorted_cache = list(self._tasks.values())
+        return self._sorted_cache
 
     def get(self, task_id: int) -> Task | None:
         """Return a task by its ID.
@@ -106,10 +119,13 @@ class TaskManager:
         Returns:
             True if the task was deleted, False if task not found
         """
-        if task_id in self._tasks:
-            del self._tasks[task_id]
-            return True
-        return False
+        task = self._tasks.pop(task_id, None)
+        if task is None:
+            return False
+        if task.completed:
+            self._completed_count -= 1
+        self._sorted_cache = None
+        return True
 
     def toggle_complete(self, task_id: int) -> bool:
         """Toggle the completion status of a task.
@@ -128,26 +144,30 @@ class TaskManager:
             return False
 
         task.completed = not task.completed
+        self._completed_count += 1 if task.completed else -1
         task.updated_at = datetime.now()
         return True
 
-    def get_ids(self) -> set[int]:
-        """Return the set of all existing task IDs.
+    def get_ids(self) -> KeysView[int]:
+        """Return all existing task IDs.
 
         Returns:
-            Set of task IDs for validation purposes
+            Live, set-like view of task IDs for validation purposes (O(1)
+            membership, no copy); wrap in set() if a snapshot is needed
         """
-        return set(self._tasks.keys())
+        return self._tasks.keys()
 
     def get_stats(self) -> dict[str, int]:
         """Return statistics about the tasks.
 
+        Counts are maintained as tasks change, so this does not iterate
+        over the tasks.
+
         Returns:
             Dictionary with keys: 'total', 'completed', 'pending'
         """
-        tasks = list(self._tasks.values())
-        total = len(tasks)
-        completed = sum(1 for t in tasks if t.completed)
+        total = len(self._tasks)
+        completed = self._completed_count
         return {
             "total": total,
             "completed": completed,
@@ -4,11 +4,12 @@ This module defines the Task dataclass and validation functions
 as specified in specs/phase1/data-model.md.
 """
 
+from collections.abc import Container
 from dataclasses import dataclass, field
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     """Represents a single todo task.
 
@@ -80,7 +81,7 @@ def validate_description(description: str) -> tuple[bool, str]:
     return (True, cleaned)
 
 
-def validate_id(id_input: str, existing_ids: set[int]) -> tuple[bool, int | str]:
+def validate_id(id_input: str, existing_ids: Container[int]) -> tuple[bool, int | str]:
     """Validate task ID input.
 
     Rules:
@@ -89,16 +90,22 @@ def validate_id(id_input: str, existing_ids: set[int]) -> tuple[bool, int | str]
 
     Args:
         id_input: The ID string to validate
-        existing_ids: Set of existing task IDs
+        existing_ids: Existing task IDs (any container, e.g. a set or dict keys)
 
     Returns:
         tuple: (is_valid, parsed_id or error_message)
             - If valid: (True, parsed_id as int)
             - If invalid: (False, error_message)
     """
-    # Try to parse as integer
+    # Reject non-numeric input without raising; a leading sign is let through
+    # so that "-1" reaches the positive-number check below
+    cleaned = id_input.strip()
+    if not cleaned.lstrip("+-").isdecimal():
+        return (False, "Please enter a valid number")
+
+    # Try to parse as integer ("--1" and the like still fail here)
     try:
-        parsed_id = int(id_input.strip())
+        parsed_id = int(cleaned)
     except ValueError:
         return (False, "Please enter a valid number")
 
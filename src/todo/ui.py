@@ -4,6 +4,8 @@ This module provides all UI-related functions for the console application
 as specified in specs/phase1/ui-spec.md.
 """
 
+from datetime import datetime
+from functools import lru_cache
 from typing import Callable
 
 from .models import Task
@@ -22,6 +24,11 @@ BOX_MR = "╣"
 STATUS_PENDING = "[ ]"
 STATUS_COMPLETE = "[x]"
 
+# Per-status text, indexed by Task.completed (False -> 0, True -> 1)
+_STATUS_MARKS = (STATUS_PENDING, STATUS_COMPLETE)
+_STATUS_WORDS = ("pending", "completed")
+_STATUS_LABELS = ("Pending", "Completed")
+
 # Message icons
 ICON_SUCCESS = "✓"
 ICON_ERROR = "✗"
@@ -32,25 +39,38 @@ ICON_WARNING = "⚠"
 MENU_WIDTH = 40
 
 
-def show_menu() -> None:
-    """Display the main menu."""
+def _build_menu() -> str:
+    """Render the main menu box as one string (built once, at import)."""
     inner = MENU_WIDTH - 2
     title = "TODO APP - Phase I"
 
-    print()
-    print(f"{BOX_TL}{BOX_H * inner}{BOX_TR}")
-    print(f"{BOX_V}{title:^{inner}}{BOX_V}")
-    print(f"{BOX_ML}{BOX_H * inner}{BOX_MR}")
-    print(f"{BOX_V}{' ' * inner}{BOX_V}")
-    print(f"{BOX_V}{'   1. Add Task':<{inner}}{BOX_V}")
-    print(f"{BOX_V}{'   2. View Tasks':<{inner}}{BOX_V}")
-    print(f"{BOX_V}{'   3. Update Task':<{inner}}{BOX_V}")
-    print(f"{BOX_V}{'   4. Delete Task':<{inner}}{BOX_V}")
-    print(f"{BOX_V}{'   5. Mark Complete':<{inner}}{BOX_V}")
-    print(f"{BOX_V}{'   0. Exit':<{inner}}{BOX_V}")
-    print(f"{BOX_V}{' ' * inner}{BOX_V}")
-    print(f"{BOX_BL}{BOX_H * inner}{BOX_BR}")
-    print()
+    lines = [
+        "",
+        f"{BOX_TL}{BOX_H * inner}{BOX_TR}",
+        f"{BOX_V}{title:^{inner}}{BOX_V}",
+        f"{BOX_ML}{BOX_H * inner}{BOX_MR}",
+        f"{BOX_V}{' ' * inner}{BOX_V}",
+        f"{BOX_V}{'   1. Add Task':<{inner}}{BOX_V}",
+        f"{BOX_V}{'   2. View Tasks':<{inner}}{BOX_V}",
+        f"{BOX_V}{'   3. Update Task':<{inner}}{BOX_V}",
+        f"{BOX_V}{'   4. Delete Task':<{inner}}{BOX_V}",
+        f"{BOX_V}{'   5. Mark Complete':<{inner}}{BOX_V}",
+        f"{BOX_V}{'   0. Exit':<{inner}}{BOX_V}",
+        f"{BOX_V}{' ' * inner}{BOX_V}",
+        f"{BOX_BL}{BOX_H * inner}{BOX_BR}",
+        "",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+# Static output, formatted once instead of on every display
+_MENU_TEXT = _build_menu()
+_SEPARATOR = "─" * 35
+
+
+def show_menu() -> None:
+    """Display the main menu."""
+    print(_MENU_TEXT, end="")
 
 
 def show_header(title: str) -> None:
@@ -100,7 +120,7 @@ def show_warning(message: str) -> None:
 
 def show_separator() -> None:
     """Display a horizontal separator line."""
-    print("─" * 35)
+    print(_SEPARATOR)
 
 
 def truncate(text: str, max_length: int = 50) -> str:
@@ -121,13 +141,27 @@ def truncate(text: str, max_length: int = 50) -> str:
 def format_datetime(dt) -> str:
     """Format a datetime for display.
 
+    Uses isoformat rather than strftime, which skips format-string parsing.
+
     Args:
-        dt: datetime object to format
+        dt: Naive datetime object to format (as stored on Task)
 
     Returns:
         Formatted string "YYYY-MM-DD HH:MM"
     """
-    return dt.strftime("%Y-%m-%d %H:%M")
+    return dt.isoformat(sep=" ", timespec="minutes")
+
+
+@lru_cache(maxsize=1024)
+def _desc_preview(description: str) -> str:
+    """Truncated description for list display, memoized across re-renders."""
+    return truncate(description, 50)
+
+
+@lru_cache(maxsize=1024)
+def _created_text(created_at: datetime) -> str:
+    """Formatted creation time, memoized since it never changes."""
+    return format_datetime(created_at)
 
 
 def format_task_brief(task: Task) -> str:
@@ -141,7 +175,7 @@ def format_task_brief(task: Task) -> str:
     Returns:
         Formatted task string
     """
-    status = "completed" if task.completed else "pending"
+    status = _STATUS_WORDS[task.completed]
     return f"  #{task.id}: {task.title} [{status}]"
 
 
@@ -159,16 +193,15 @@ def format_task_full(task: Task) -> str:
     Returns:
         Formatted task string with multiple lines
     """
-    status = STATUS_COMPLETE if task.completed else STATUS_PENDING
-    lines = [f"{status} #{task.id}: {task.title}"]
+    status = _STATUS_MARKS[task.completed]
+    head = f"{status} #{task.id}: {task.title}"
+    created = _created_text(task.created_at)
 
+    # One f-string per shape instead of building and joining a list of lines
     if task.description:
-        desc_preview = truncate(task.description, 50)
-        lines.append(f"    {desc_preview}")
-
-    lines.append(f"    Created: {format_datetime(task.created_at)}")
-
-    return "\n".join(lines)
+        desc_preview = _desc_preview(task.description)
+        return f"{head}\n    {desc_preview}\n    Created: {created}"
+    return f"{head}\n    Created: {created}"
 
 
 def format_task_detail(task: Task) -> str:
@@ -186,38 +219,46 @@ def format_task_detail(task: Task) -> str:
     Returns:
         Formatted task string with all details
     """
-    status = "Completed" if task.completed else "Pending"
+    status = _STATUS_LABELS[task.completed]
     lines = [
         f"  #{task.id}: {task.title}",
         f"  Description: {task.description or '(none)'}",
         f"  Status: {status}",
-        f"  Created: {format_datetime(task.created_at)}",
+        f"  Created: {_created_text(task.created_at)}",
     ]
     return "\n".join(lines)
 
 
-def show_task_list(tasks: list[Task], show_summary: bool = True) -> None:
+def show_task_list(
+    tasks: list[Task],
+    show_summary: bool = True,
+    stats: dict[str, int] | None = None,
+) -> None:
     """Display a list of tasks in full format.
 
     Args:
         tasks: List of tasks to display
         show_summary: Whether to show the summary footer
+        stats: Precomputed 'total'/'completed'/'pending' counts for the
+            footer (e.g. TaskManager.get_stats()); counted from tasks if None
     """
     if not tasks:
         print("\nNo tasks yet. Add one to get started!\n")
         return
 
-    print()
-    for task in tasks:
-        print(format_task_full(task))
-        print()
+    # One write for the whole list rather than two prints per task
+    print("\n" + "\n\n".join(map(format_task_full, tasks)) + "\n")
 
     if show_summary:
-        total = len(tasks)
-        completed = sum(1 for t in tasks if t.completed)
-        pending = total - completed
+        if stats is None:
+            total = len(tasks)
+            completed = sum(t.completed for t in tasks)  # bools sum as 0/1
+            stats = {"total": total, "completed": completed, "pending": total - completed}
         show_separator()
-        print(f"Total: {total} | Completed: {completed} | Pending: {pending}")
+        print(
+            f"Total: {stats['total']} | Completed: {stats['completed']} "
+            f"| Pending: {stats['pending']}"
+        )
         print()
 
 
@@ -231,10 +272,7 @@ def show_task_list_brief(tasks: list[Task]) -> None:
         print("\nNo tasks yet. Add one to get started!\n")
         return
 
-    print("\nCurrent tasks:")
-    for task in tasks:
-        print(format_task_brief(task))
-    print()
+    print("\nCurrent tasks:\n" + "\n".join(map(format_task_brief, tasks)) + "\n")
 
 
 def get_input(prompt: str) -> str:
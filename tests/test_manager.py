@@ -78,6 +78,19 @@ class TestTaskManagerGetAll:
         tasks = manager.get_all()
         assert [t.id for t in tasks] == [1, 2, 3]
 
+    def test_get_all_reflects_add_and_delete(self):
+        """Test get_all is refreshed after tasks are added or deleted."""
+        manager = TaskManager()
+        manager.add("Task 1")
+        manager.add("Task 2")
+        manager.get_all()
+
+        manager.delete(1)
+        assert [t.id for t in manager.get_all()] == [2]
+
+        manager.add("Task 3")
+        assert [t.id for t in manager.get_all()] == [2, 3]
+
 
 class TestTaskManagerGet:
     """Tests for TaskManager.get method."""
@@ -274,6 +287,18 @@ class TestTaskManagerHelpers:
         assert stats["completed"] == 1
         assert stats["pending"] == 2
 
+    def test_get_stats_after_toggle_and_delete(self):
+        """Test get_stats stays correct as tasks are toggled and deleted."""
+        manager = TaskManager()
+        manager.add("Task 1")
+        manager.add("Task 2")
+        manager.toggle_complete(1)
+        manager.toggle_complete(2)
+        manager.toggle_complete(2)
+        manager.delete(1)
+
+        assert manager.get_stats() == {"total": 1, "completed": 0, "pending": 1}
+
     def test_is_empty_true(self):
         """Test is_empty returns True when no tasks."""
         manager = TaskManager()
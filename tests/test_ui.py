@@ -12,28 +12,38 @@ from todo.ui import (
     format_task_detail,
 )
 
+# Shared creation time for the formatted-task tests
+FIXED_DT = datetime(2024, 1, 15, 10, 30)
 
-class TestTruncate:
-    """Tests for truncate function."""
+# Over-length inputs for the truncation tests
+_A60 = "a" * 60
+_A100 = "a" * 100
 
-    def test_short_text_unchanged(self):
-        """Test that short text is not truncated."""
-        result = truncate("Hello", 10)
-        assert result == "Hello"
 
-    def test_exact_length_unchanged(self):
-        """Test that text at exact length is not truncated."""
-        result = truncate("Hello", 5)
-        assert result == "Hello"
+def _lines(result: str) -> set[str]:
+    """Split formatted output into a set of its lines, indentation removed."""
+    return {line.strip() for line in result.splitlines()}
 
-    def test_long_text_truncated(self):
-        """Test that long text is truncated with ellipsis."""
-        result = truncate("Hello World", 8)
-        assert result == "Hello..."
+
+class TestTruncate:
+    """Tests for truncate function."""
+
+    @pytest.mark.parametrize(
+        "text,max_length,expected",
+        [
+            ("Hello", 10, "Hello"),
+            ("Hello", 5, "Hello"),
+            ("Hello World", 8, "Hello..."),
+        ],
+        ids=["short_unchanged", "exact_length_unchanged", "long_truncated"],
+    )
+    def test_truncate(self, text, max_length, expected):
+        """Test that only text longer than max_length gets an ellipsis."""
+        assert truncate(text, max_length) == expected
 
     def test_default_max_length(self):
         """Test default max length of 50."""
-        text = "a" * 60
+        text = _A60
         result = truncate(text)
         assert len(result) == 50
         assert result.endswith("...")
@@ -52,17 +62,18 @@ class TestFormatDatetime:
 class TestFormatTaskBrief:
     """Tests for format_task_brief function."""
 
-    def test_pending_task(self):
-        """Test formatting a pending task."""
-        task = Task(id=1, title="Buy groceries", completed=False)
-        result = format_task_brief(task)
-        assert result == "  #1: Buy groceries [pending]"
-
-    def test_completed_task(self):
-        """Test formatting a completed task."""
-        task = Task(id=2, title="Call mom", completed=True)
-        result = format_task_brief(task)
-        assert result == "  #2: Call mom [completed]"
+    @pytest.mark.parametrize(
+        "task_id,title,completed,expected",
+        [
+            (1, "Buy groceries", False, "  #1: Buy groceries [pending]"),
+            (2, "Call mom", True, "  #2: Call mom [completed]"),
+        ],
+        ids=["pending", "completed"],
+    )
+    def test_format_task_brief(self, task_id, title, completed, expected):
+        """Test formatting a pending or completed task."""
+        task = Task(id=task_id, title=title, completed=completed)
+        assert format_task_brief(task) == expected
 
 
 class TestFormatTaskFull:
@@ -74,12 +85,11 @@ class TestFormatTaskFull:
             id=1,
             title="Buy groceries",
             completed=False,
-            created_at=datetime(2024, 1, 15, 10, 30),
+            created_at=FIXED_DT,
         )
         result = format_task_full(task)
 
-        assert "[ ] #1: Buy groceries" in result
-        assert "Created: 2024-01-15 10:30" in result
+        assert {"[ ] #1: Buy groceries", "Created: 2024-01-15 10:30"} <= _lines(result)
 
     def test_completed_task_with_description(self):
         """Test formatting a completed task with description."""
@@ -88,20 +98,19 @@ class TestFormatTaskFull:
             title="Call mom",
             description="Ask about birthday plans",
             completed=True,
-            created_at=datetime(2024, 1, 15, 10, 30),
+            created_at=FIXED_DT,
         )
         result = format_task_full(task)
 
-        assert "[x] #2: Call mom" in result
-        assert "Ask about birthday plans" in result
+        assert {"[x] #2: Call mom", "Ask about birthday plans"} <= _lines(result)
 
     def test_long_description_truncated(self):
         """Test that long descriptions are truncated."""
         task = Task(
             id=1,
             title="Task",
-            description="a" * 100,
-            created_at=datetime(2024, 1, 15, 10, 30),
+            description=_A100,
+            created_at=FIXED_DT,
         )
         result = format_task_full(task)
 
@@ -112,44 +121,34 @@ class TestFormatTaskFull:
 class TestFormatTaskDetail:
     """Tests for format_task_detail function."""
 
-    def test_pending_task(self):
-        """Test formatting a pending task detail."""
+    @pytest.mark.parametrize(
+        "title,description,completed,expected",
+        [
+            (
+                "Buy groceries",
+                "Get milk",
+                False,
+                (
+                    "#1: Buy groceries",
+                    "Description: Get milk",
+                    "Status: Pending",
+                    "Created: 2024-01-15 10:30",
+                ),
+            ),
+            ("Task", "", True, ("Status: Completed",)),
+            ("Task", "", False, ("Description: (none)",)),
+        ],
+        ids=["pending", "completed", "no_description"],
+    )
+    def test_format_task_detail(self, title, description, completed, expected):
+        """Test detail formatting of status, description and creation time."""
         task = Task(
             id=1,
-            title="Buy groceries",
-            description="Get milk",
-            completed=False,
-            created_at=datetime(2024, 1, 15, 10, 30),
-        )
-        result = format_task_detail(task)
-
-        assert "#1: Buy groceries" in result
-        assert "Description: Get milk" in result
-        assert "Status: Pending" in result
-        assert "Created: 2024-01-15 10:30" in result
-
-    def test_completed_task(self):
-        """Test formatting a completed task detail."""
-        task = Task(
-            id=1,
-            title="Task",
-            description="",
-            completed=True,
-            created_at=datetime(2024, 1, 15, 10, 30),
-        )
-        result = format_task_detail(task)
-
-        assert "Status: Completed" in result
-
-    def test_no_description(self):
-        """Test formatting task with no description."""
-        task = Task(
-            id=1,
-            title="Task",
-            description="",
-            completed=False,
-            created_at=datetime(2024, 1, 15, 10, 30),
+            title=title,
+            description=description,
+            completed=completed,
+            created_at=FIXED_DT,
         )
         result = format_task_detail(task)
 
-        assert "Description: (none)" in result
+        assert set(expected) <= _lines(result)